@@ -19,25 +19,107 @@ import os
 import random
 import re
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from itertools import combinations
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from pypdf import PdfReader
 from tqdm import tqdm
 
 from .report import generate_html_report
-from .tests import BaselineTest, BasePDFTest, load_tests
+from .tests import BaselineTest, BasePDFTest, PageEvaluator, load_tests
 from .utils import calculate_bootstrap_ci, perform_permutation_test
 
 
+def evaluate_page(
+    pdf_name: str, page: int, page_tests: List[BasePDFTest], page_md_files: List[str]
+) -> List[Tuple[float, Optional[str], List[str], Tuple[bool, str]]]:
+    """
+    Evaluate all the tests of a single page against each of its MD repeats.
+
+    This runs inside a worker process, so it only takes picklable arguments and returns plain tuples,
+    one (test_avg, test_failure, errors, (final_passed, final_explanation)) per test, in the order of page_tests.
+    """
+    local_errors = []
+    md_base = os.path.splitext(pdf_name)[0]
+    evaluator = PageEvaluator(page_tests)
+    repeat_passes = {test.id: 0 for test in page_tests}
+    explanations = {test.id: [] for test in page_tests}
+    num_repeats = len(page_md_files)
+
+    for md_path in page_md_files:
+        try:
+            with open(md_path, "r", encoding="utf-8") as f:
+                md_content = f.read()
+        except Exception as e:
+            local_errors.append(f"Error reading {md_path}: {e}")
+            continue
+
+        for test, passed, explanation, error in evaluator.run(md_content):
+            if error is not None:
+                local_errors.append(f"Error running test {test.id} on {md_path}: {error}")
+                explanations[test.id].append(explanation)
+            elif passed:
+                repeat_passes[test.id] += 1
+            else:
+                explanations[test.id].append(explanation)
+
+    page_results = []
+    for test in page_tests:
+        test_explanations = explanations[test.id]
+        test_avg = repeat_passes[test.id] / num_repeats if num_repeats > 0 else 0.0
+        final_passed = test_avg > 0.5  # Consider test passed if majority of repeats pass
+        final_explanation = test_explanations[0] if test_explanations else "All repeats passed"
+
+        test_failure = None
+        if test_avg < 1.0:
+            test_failure = (
+                f"Test {test.id} on {md_base} page {page} average pass ratio: {test_avg:.3f} "
+                f"({repeat_passes[test.id]}/{num_repeats} repeats passed). Ex: {test_explanations[0] if test_explanations else 'No explanation'}"
+            )
+        page_results.append((test_avg, test_failure, local_errors, (final_passed, final_explanation)))
+        # Page level errors only need to be reported once
+        local_errors = []
+
+    return page_results
+
+
+def _record_page_results(
+    page_tests: List[BasePDFTest],
+    page_results: List[Tuple[float, Optional[str], List[str], Tuple[bool, str]]],
+    candidate_errors: List[str],
+    test_failures: List[str],
+    test_type_breakdown: Dict[str, List[float]],
+    all_test_scores: List[float],
+    test_results: Dict[str, Dict[int, List[Tuple[BasePDFTest, bool, str]]]],
+) -> float:
+    """
+    Fold the results of one page into the candidate's accumulators, returning the page's summed test score.
+    """
+    page_score = 0.0
+    for test, (test_avg, test_failure, errors, (final_passed, final_explanation)) in zip(page_tests, page_results):
+        # Store the test result for reporting
+        test_results.setdefault(test.pdf, {}).setdefault(test.page, []).append((test, final_passed, final_explanation))
+
+        all_test_scores.append(test_avg)
+        page_score += test_avg
+        if test_failure:
+            test_failures.append(test_failure)
+        if test.type not in test_type_breakdown:
+            test_type_breakdown[test.type] = []
+        test_type_breakdown[test.type].append(test_avg)
+        if errors:
+            candidate_errors.extend(errors)
+    return page_score
+
+
 def evaluate_candidate(
     candidate_folder: str, all_tests: List[BasePDFTest], pdf_basenames: List[str], force: bool = False
 ) -> Tuple[float, int, List[str], List[str], Dict[str, List[float]], List[float], Dict[str, Dict[int, List[Tuple[BasePDFTest, bool, str]]]]]:
     """
     For the candidate folder (pipeline tool output), validate that it contains at least one .md file
     (i.e. repeated generations like _pg{page}_repeat{repeat}.md) for every PDF in the pdf folder.
-    Then, run each rule against all corresponding .md files concurrently and average the results.
+    Then, run each rule against all corresponding .md files and average the results, evaluating pages concurrently.
 
     Returns a tuple:
       (overall_score, total_tests, candidate_errors, test_failures, test_type_breakdown, all_test_scores, test_results)
@@ -76,84 +158,44 @@ def evaluate_candidate(
     if candidate_errors:
         return (0.0, len(all_tests), candidate_errors, test_failures, test_type_breakdown, all_test_scores, test_results)
 
-    # Define an inner function to evaluate a single test
-    def process_test(test: BasePDFTest) -> Tuple[float, str, str, List[str], Tuple[bool, str]]:
-        local_errors = []
-        test_failure = None
-        pdf_name = test.pdf
-
-        # Initialize the test_results structure if needed
-        if pdf_name not in test_results:
-            test_results[pdf_name] = {}
-        if test.page not in test_results[pdf_name]:
-            test_results[pdf_name][test.page] = []
-
-        md_base = os.path.splitext(pdf_name)[0]
-        md_files = pdf_to_md_files.get(pdf_name, [])
-        # Filter MD files for the specific page corresponding to the test
-        page_md_files = [f for f in md_files if re.search(rf"_pg{test.page}_", os.path.basename(f))]
-        if not page_md_files:
-            local_errors.append(
-                f"Candidate '{candidate_name}' is missing MD repeats for {pdf_name} page {test.page} "
-                f"(expected files matching {md_base}_pg{test.page}_repeat*.md)."
-            )
-            test_results[pdf_name][test.page].append((test, False, "Missing MD files"))
-            return (0.0, None, test.type, local_errors, (False, "Missing MD files"))
-
-        repeat_passes = 0
-        num_repeats = 0
-        explanations = []
-        for md_path in page_md_files:
-            num_repeats += 1
-            try:
-                with open(md_path, "r", encoding="utf-8") as f:
-                    md_content = f.read()
-            except Exception as e:
-                local_errors.append(f"Error reading {md_path}: {e}")
-                continue
-
-            try:
-                passed, explanation = test.run(md_content)
-                if passed:
-                    repeat_passes += 1
-                else:
-                    explanations.append(explanation)
-            except Exception as e:
-                local_errors.append(f"Error running test {test.id} on {md_path}: {e}")
-                explanations.append(str(e))
-
-        test_avg = repeat_passes / num_repeats if num_repeats > 0 else 0.0
-        final_passed = test_avg > 0.5  # Consider test passed if majority of repeats pass
-        final_explanation = explanations[0] if explanations else "All repeats passed"
-
-        # Store the test result for reporting
-        test_results[pdf_name][test.page].append((test, final_passed, final_explanation))
-
-        if test_avg < 1.0:
-            test_failure = (
-                f"Test {test.id} on {md_base} page {test.page} average pass ratio: {test_avg:.3f} "
-                f"({repeat_passes}/{num_repeats} repeats passed). Ex: {explanations[0] if explanations else 'No explanation'}"
-            )
-        return (test_avg, test_failure, test.type, local_errors, (final_passed, final_explanation))
+    # Group the tests by page, so that each page's MD repeats are read once and all of its tests are evaluated together
+    tests_by_page: Dict[Tuple[str, int], List[BasePDFTest]] = {}
+    for test in all_tests:
+        tests_by_page.setdefault((test.pdf, test.page), []).append(test)
 
     total_test_score = 0.0
-    futures = []
-    # Use a thread pool to evaluate each test concurrently.
-    with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, 64)) as executor:
-        futures = [executor.submit(process_test, test) for test in all_tests]
+    futures = {}
+    # Pages are independent and CPU bound, so fan them out over worker processes; each worker reads the page's MD repeats
+    # and evaluates all of its tests, and only the per-test scores are sent back to this process
+    with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, 64)) as executor:
         # tqdm progress bar for this candidate's tests
-        for future in tqdm(as_completed(futures), total=len(futures), desc=f"Evaluating tests for {candidate_name}", unit="test"):
-            test_avg, test_failure, test_type, errors, _ = future.result()
-            all_test_scores.append(test_avg)
-            total_test_score += test_avg
-            if test_failure:
-                test_failures.append(test_failure)
-            if test_type not in test_type_breakdown:
-                test_type_breakdown[test_type] = []
-            test_type_breakdown[test_type].append(test_avg)
-            local_errors = errors
-            if local_errors:
-                candidate_errors.extend(local_errors)
+        with tqdm(total=len(all_tests), desc=f"Evaluating tests for {candidate_name}", unit="test") as pbar:
+            for (pdf_name, page), page_tests in tests_by_page.items():
+                md_base = os.path.splitext(pdf_name)[0]
+                md_files = pdf_to_md_files.get(pdf_name, [])
+                # Filter MD files for the specific page corresponding to the tests
+                page_md_files = [f for f in md_files if re.search(rf"_pg{page}_", os.path.basename(f))]
+                if not page_md_files:
+                    missing_error = (
+                        f"Candidate '{candidate_name}' is missing MD repeats for {pdf_name} page {page} "
+                        f"(expected files matching {md_base}_pg{page}_repeat*.md)."
+                    )
+                    page_results = [(0.0, None, [missing_error], (False, "Missing MD files")) for _ in page_tests]
+                    total_test_score += _record_page_results(
+                        page_tests, page_results, candidate_errors, test_failures, test_type_breakdown, all_test_scores, test_results
+                    )
+                    pbar.update(len(page_tests))
+                    continue
+
+                futures[executor.submit(evaluate_page, pdf_name, page, page_tests, page_md_files)] = page_tests
+
+            for future in as_completed(futures):
+                page_tests = futures[future]
+                page_results = future.result()
+                total_test_score += _record_page_results(
+                    page_tests, page_results, candidate_errors, test_failures, test_type_breakdown, all_test_scores, test_results
+                )
+                pbar.update(len(page_tests))
 
     overall_score = total_test_score / len(all_tests) if all_tests else 0.0
     return (overall_score, len(all_tests), candidate_errors, test_failures, test_type_breakdown, all_test_scores, test_results)
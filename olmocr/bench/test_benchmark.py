@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+
+from olmocr.bench.benchmark import evaluate_candidate, evaluate_page
+from olmocr.bench.tests import TestType, TextPresenceTest
+
+
+class TestEvaluatePage(unittest.TestCase):
+    """Test the per-page evaluation that runs in the benchmark's worker processes"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.passing = TextPresenceTest(pdf="doc.pdf", page=1, id="passing", type=TestType.PRESENT.value, text="Hello world")
+        self.failing = TextPresenceTest(pdf="doc.pdf", page=1, id="failing", type=TestType.PRESENT.value, text="Goodbye moon")
+
+    def write_repeat(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_passing_and_failing_tests(self):
+        """Test that results come back per test, in order, averaged over the repeats"""
+        md_files = [self.write_repeat(f"doc_pg1_repeat{i}.md", b"Hello world, this is page one.") for i in (1, 2)]
+
+        results = evaluate_page("doc.pdf", 1, [self.passing, self.failing], md_files)
+
+        assert len(results) == 2
+        assert results[0] == (1.0, None, [], (True, "All repeats passed"))
+
+        test_avg, test_failure, errors, (passed, explanation) = results[1]
+        assert test_avg == 0.0
+        assert not passed
+        assert "Goodbye moon" in explanation
+        assert "Test failing on doc page 1 average pass ratio: 0.000 (0/2 repeats passed)" in test_failure
+        assert errors == []
+
+    def test_missing_md_file(self):
+        """Test that a repeat which cannot be found counts as a failed repeat and is reported once for the page"""
+        md_files = [
+            self.write_repeat("doc_pg1_repeat1.md", b"Hello world"),
+            os.path.join(self.tmpdir.name, "doc_pg1_repeat2.md"),
+        ]
+
+        results = evaluate_page("doc.pdf", 1, [self.passing, self.failing], md_files)
+
+        test_avg, test_failure, errors, (passed, _) = results[0]
+        assert test_avg == 0.5
+        assert not passed
+        assert "(1/2 repeats passed)" in test_failure
+        assert len(errors) == 1
+        assert errors[0].startswith(f"Error reading {md_files[1]}")
+
+        # Page level errors are only attached to the first test of the page
+        assert results[1][2] == []
+
+    def test_unreadable_repeat(self):
+        """Test that a repeat which is not valid UTF-8 is reported as a read error rather than raising"""
+        md_files = [
+            self.write_repeat("doc_pg1_repeat1.md", b"Hello world"),
+            self.write_repeat("doc_pg1_repeat2.md", b"Hello world \xff\xfe"),
+        ]
+
+        results = evaluate_page("doc.pdf", 1, [self.passing], md_files)
+
+        test_avg, _, errors, _ = results[0]
+        assert test_avg == 0.5
+        assert len(errors) == 1
+        assert f"Error reading {md_files[1]}" in errors[0]
+
+
+class TestEvaluateCandidate(unittest.TestCase):
+    """Test how evaluate_candidate gathers the page results"""
+
+    def test_missing_page_repeats(self):
+        """Test that tests on a page without any MD repeats fail with a candidate error, while other pages are evaluated"""
+        with tempfile.TemporaryDirectory() as candidate_folder:
+            with open(os.path.join(candidate_folder, "doc_pg1_repeat1.md"), "w", encoding="utf-8") as f:
+                f.write("Hello world")
+
+            on_page_one = TextPresenceTest(pdf="doc.pdf", page=1, id="page_one", type=TestType.PRESENT.value, text="Hello world")
+            on_page_two = TextPresenceTest(pdf="doc.pdf", page=2, id="page_two", type=TestType.PRESENT.value, text="Hello world")
+
+            overall_score, total_tests, candidate_errors, test_failures, test_type_breakdown, all_test_scores, test_results = evaluate_candidate(
+                candidate_folder, [on_page_one, on_page_two], ["doc.pdf"]
+            )
+
+        assert total_tests == 2
+        assert overall_score == 0.5
+        assert sorted(all_test_scores) == [0.0, 1.0]
+        assert list(test_type_breakdown) == [TestType.PRESENT.value]
+        assert sorted(test_type_breakdown[TestType.PRESENT.value]) == [0.0, 1.0]
+        assert test_failures == []
+        assert len(candidate_errors) == 1
+        assert "is missing MD repeats for doc.pdf page 2" in candidate_errors[0]
+        assert test_results["doc.pdf"][1] == [(on_page_one, True, "All repeats passed")]
+        assert test_results["doc.pdf"][2] == [(on_page_two, False, "Missing MD files")]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,31 @@
+import json
+import pickle
+import sys
 import unittest
+import warnings
+from dataclasses import fields
+from unittest.mock import Mock
 
+import pytest
+
+from olmocr.bench import tests as _bench_tests
 from olmocr.bench.tests import (
     BaselineTest,
     BasePDFTest,
     MathTest,
+    PageEvaluator,
     TableTest,
     TestChecked,
     TestType,
     TextOrderTest,
     TextPresenceTest,
     ValidationError,
+    _extract_html_tables,
+    _extract_html_tables_lxml,
+    _extract_html_tables_simple,
+    load_tests,
     normalize_text,
+    save_tests,
 )
 
 
@@ -21,29 +36,29 @@ class TestNormalizeText(unittest.TestCase):
         """Test that whitespace is properly normalized"""
         input_text = "This  has\tmultiple    spaces\nand\nnewlines"
         expected = "This has multiple spaces and newlines"
-        self.assertEqual(normalize_text(input_text), expected)
+        assert normalize_text(input_text) == expected
 
     def test_character_replacement(self):
         """Test that fancy characters are replaced with ASCII equivalents"""
         input_text = "This has 'fancy' “quotes” and—dashes"
         expected = "This has 'fancy' \"quotes\" and-dashes"
-        self.assertEqual(normalize_text(input_text), expected)
+        assert normalize_text(input_text) == expected
 
     def test_markdown1(self):
         """Test that fancy characters are replaced with ASCII equivalents"""
         input_text = "this is *bold*"
         expected = "this is bold"
-        self.assertEqual(normalize_text(input_text), expected)
+        assert normalize_text(input_text) == expected
 
     def test_markdown2(self):
         """Test that fancy characters are replaced with ASCII equivalents"""
         input_text = "_italic__ is *bold*"
         expected = "italic_ is bold"
-        self.assertEqual(normalize_text(input_text), expected)
+        assert normalize_text(input_text) == expected
 
     def test_empty_input(self):
         """Test that empty input returns empty output"""
-        self.assertEqual(normalize_text(""), "")
+        assert normalize_text("") == ""
 
 
 class TestBasePDFTest(unittest.TestCase):
@@ -52,44 +67,44 @@ class TestBasePDFTest(unittest.TestCase):
     def test_valid_initialization(self):
         """Test that a valid initialization works"""
         test = BasePDFTest(pdf="test.pdf", page=1, id="test_id", type=TestType.BASELINE.value)
-        self.assertEqual(test.pdf, "test.pdf")
-        self.assertEqual(test.page, 1)
-        self.assertEqual(test.id, "test_id")
-        self.assertEqual(test.type, TestType.BASELINE.value)
-        self.assertEqual(test.max_diffs, 0)
-        self.assertIsNone(test.checked)
-        self.assertIsNone(test.url)
+        assert test.pdf == "test.pdf"
+        assert test.page == 1
+        assert test.id == "test_id"
+        assert test.type == TestType.BASELINE.value
+        assert test.max_diffs == 0
+        assert test.checked is None
+        assert test.url is None
 
     def test_empty_pdf(self):
         """Test that empty PDF raises ValidationError"""
-        with self.assertRaises(ValidationError):
+        with pytest.raises(ValidationError):
             BasePDFTest(pdf="", page=1, id="test_id", type=TestType.BASELINE.value)
 
     def test_empty_id(self):
         """Test that empty ID raises ValidationError"""
-        with self.assertRaises(ValidationError):
+        with pytest.raises(ValidationError):
             BasePDFTest(pdf="test.pdf", page=1, id="", type=TestType.BASELINE.value)
 
     def test_negative_max_diffs(self):
         """Test that negative max_diffs raises ValidationError"""
-        with self.assertRaises(ValidationError):
+        with pytest.raises(ValidationError):
             BasePDFTest(pdf="test.pdf", page=1, id="test_id", type=TestType.BASELINE.value, max_diffs=-1)
 
     def test_invalid_test_type(self):
         """Test that invalid test type raises ValidationError"""
-        with self.assertRaises(ValidationError):
+        with pytest.raises(ValidationError):
             BasePDFTest(pdf="test.pdf", page=1, id="test_id", type="invalid_type")
 
     def test_run_method_not_implemented(self):
         """Test that run method raises NotImplementedError"""
         test = BasePDFTest(pdf="test.pdf", page=1, id="test_id", type=TestType.BASELINE.value)
-        with self.assertRaises(NotImplementedError):
+        with pytest.raises(NotImplementedError):
             test.run("content")
 
     def test_checked_enum(self):
         """Test that checked accepts valid TestChecked enums"""
         test = BasePDFTest(pdf="test.pdf", page=1, id="test_id", type=TestType.BASELINE.value, checked=TestChecked.VERIFIED)
-        self.assertEqual(test.checked, TestChecked.VERIFIED)
+        assert test.checked == TestChecked.VERIFIED
 
 
 class TestTextPresenceTest(unittest.TestCase):
@@ -98,110 +113,119 @@ class TestTextPresenceTest(unittest.TestCase):
     def test_valid_present_test(self):
         """Test that a valid PRESENT test initializes correctly"""
         test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.PRESENT.value, text="test text")
-        self.assertEqual(test.text, "test text")
-        self.assertTrue(test.case_sensitive)
-        self.assertIsNone(test.first_n)
-        self.assertIsNone(test.last_n)
+        assert test.text == "test text"
+        assert test.case_sensitive
+        assert test.first_n is None
+        assert test.last_n is None
 
     def test_valid_absent_test(self):
         """Test that a valid ABSENT test initializes correctly"""
         test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.ABSENT.value, text="test text", case_sensitive=False)
-        self.assertEqual(test.text, "test text")
-        self.assertFalse(test.case_sensitive)
+        assert test.text == "test text"
+        assert not test.case_sensitive
 
     def test_empty_text(self):
         """Test that empty text raises ValidationError"""
-        with self.assertRaises(ValidationError):
+        with pytest.raises(ValidationError):
             TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.PRESENT.value, text="")
 
+    def test_run_impl_survives_pickling(self):
+        """Test that the run implementation chosen at construction survives the pickling done for the benchmark's worker processes"""
+        for max_diffs in (0, 1):
+            test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.PRESENT.value, text="target text", max_diffs=max_diffs)
+            copy = pickle.loads(pickle.dumps(test))
+            assert copy == test
+            assert copy.run_impl is test.run_impl
+            assert copy.run("This is some target text in a document") == (True, "")
+
     def test_present_text_exact_match(self):
         """Test that PRESENT test returns True for exact match"""
         test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.PRESENT.value, text="target text")
         result, _ = test.run("This is some target text in a document")
-        self.assertTrue(result)
+        assert result
 
     def test_present_text_not_found(self):
         """Test that PRESENT test returns False when text not found"""
         test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.PRESENT.value, text="missing text")
         result, explanation = test.run("This document doesn't have the target")
-        self.assertFalse(result)
-        self.assertIn("missing text", explanation)
+        assert not result
+        assert "missing text" in explanation
 
     def test_present_text_with_max_diffs(self):
         """Test that PRESENT test with max_diffs handles fuzzy matching"""
         test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.PRESENT.value, text="target text", max_diffs=2)
         result, _ = test.run("This is some targett textt in a document")
-        self.assertTrue(result)
+        assert result
 
     def test_absent_text_found(self):
         """Test that ABSENT test returns False when text is found"""
         test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.ABSENT.value, text="target text")
         result, explanation = test.run("This is some target text in a document")
-        self.assertFalse(result)
-        self.assertIn("target text", explanation)
+        assert not result
+        assert "target text" in explanation
 
     def test_absent_text_found_diffs(self):
         """Test that ABSENT test returns False when text is found"""
         test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.ABSENT.value, text="target text", max_diffs=2)
         result, explanation = test.run("This is some target text in a document")
-        self.assertFalse(result)
+        assert not result
         result, explanation = test.run("This is some targett text in a document")
-        self.assertFalse(result)
+        assert not result
         result, explanation = test.run("This is some targettt text in a document")
-        self.assertFalse(result)
+        assert not result
         result, explanation = test.run("This is some targetttt text in a document")
-        self.assertTrue(result)
+        assert result
 
     def test_absent_text_not_found(self):
         """Test that ABSENT test returns True when text is not found"""
         test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.ABSENT.value, text="missing text")
         result, _ = test.run("This document doesn't have the target")
-        self.assertTrue(result)
+        assert result
 
     def test_case_insensitive_present(self):
         """Test that case_sensitive=False works for PRESENT test"""
         test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.PRESENT.value, text="TARGET TEXT", case_sensitive=False)
         result, _ = test.run("This is some target text in a document")
-        self.assertTrue(result)
+        assert result
 
     def test_case_insensitive_absent(self):
         """Test that case_sensitive=False works for ABSENT test"""
         test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.ABSENT.value, text="TARGET TEXT", case_sensitive=False)
         result, explanation = test.run("This is some target text in a document")
-        self.assertFalse(result)
+        assert not result
 
     def test_first_n_limit(self):
         """Test that first_n parameter works correctly"""
         test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.PRESENT.value, text="beginning", first_n=20)
         result, _ = test.run("beginning of text, but not the end")
-        self.assertTrue(result)
+        assert result
 
         # Test that text beyond first_n isn't matched
         test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.PRESENT.value, text="end", first_n=20)
         result, _ = test.run("beginning of text, but not the end")
-        self.assertFalse(result)
+        assert not result
 
     def test_last_n_limit(self):
         """Test that last_n parameter works correctly"""
         test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.PRESENT.value, text="end", last_n=20)
         result, _ = test.run("beginning of text, but not the end")
-        self.assertTrue(result)
+        assert result
 
         # Test that text beyond last_n isn't matched
         test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.PRESENT.value, text="beginning", last_n=20)
         result, _ = test.run("beginning of text, but not the end")
-        self.assertFalse(result)
+        assert not result
 
     def test_both_first_and_last_n(self):
         """Test that combining first_n and last_n works correctly"""
         test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.PRESENT.value, text="beginning", first_n=15, last_n=10)
         result, _ = test.run("beginning of text, middle part, but not the end")
-        self.assertTrue(result)
+        assert result
 
         # Text only in middle shouldn't be found
         test = TextPresenceTest(pdf="test.pdf", page=1, id="test_id", type=TestType.PRESENT.value, text="middle", first_n=15, last_n=10)
         result, _ = test.run("beginning of text, middle part, but not the end")
-        self.assertFalse(result)
+        assert not result
 
 
 class TestTextOrderTest(unittest.TestCase):
@@ -210,79 +234,80 @@ class TestTextOrderTest(unittest.TestCase):
     def test_valid_initialization(self):
         """Test that valid initialization works"""
         test = TextOrderTest(pdf="test.pdf", page=1, id="test_id", type=TestType.ORDER.value, before="first text", after="second text")
-        self.assertEqual(test.before, "first text")
-        self.assertEqual(test.after, "second text")
+        assert test.before == "first text"
+        assert test.after == "second text"
 
     def test_invalid_test_type(self):
         """Test that invalid test type raises ValidationError"""
-        with self.assertRaises(ValidationError):
+        with pytest.raises(ValidationError):
             TextOrderTest(pdf="test.pdf", page=1, id="test_id", type=TestType.PRESENT.value, before="first text", after="second text")
 
     def test_empty_before(self):
         """Test that empty before text raises ValidationError"""
-        with self.assertRaises(ValidationError):
+        with pytest.raises(ValidationError):
             TextOrderTest(pdf="test.pdf", page=1, id="test_id", type=TestType.ORDER.value, before="", after="second text")
 
     def test_empty_after(self):
         """Test that empty after text raises ValidationError"""
-        with self.assertRaises(ValidationError):
+        with pytest.raises(ValidationError):
             TextOrderTest(pdf="test.pdf", page=1, id="test_id", type=TestType.ORDER.value, before="first text", after="")
 
     def test_correct_order(self):
         """Test that correct order returns True"""
         test = TextOrderTest(pdf="test.pdf", page=1, id="test_id", type=TestType.ORDER.value, before="first", after="second")
         result, _ = test.run("This has first and then second in correct order")
-        self.assertTrue(result)
+        assert result
 
     def test_incorrect_order(self):
         """Test that incorrect order returns False"""
         test = TextOrderTest(pdf="test.pdf", page=1, id="test_id", type=TestType.ORDER.value, before="second", after="first")
         result, explanation = test.run("This has first and then second in correct order")
-        self.assertFalse(result)
+        assert not result
 
     def test_before_not_found(self):
         """Test that 'before' text not found returns False"""
         test = TextOrderTest(pdf="test.pdf", page=1, id="test_id", type=TestType.ORDER.value, before="missing", after="present")
         result, explanation = test.run("This text has present but not the other word")
-        self.assertFalse(result)
+        assert not result
 
     def test_after_not_found(self):
         """Test that 'after' text not found returns False"""
         test = TextOrderTest(pdf="test.pdf", page=1, id="test_id", type=TestType.ORDER.value, before="present", after="missing")
         result, explanation = test.run("This text has present but not the other word")
-        self.assertFalse(result)
+        assert not result
 
     def test_max_diffs(self):
         """Test that max_diffs parameter works correctly"""
         test = TextOrderTest(pdf="test.pdf", page=1, id="test_id", type=TestType.ORDER.value, before="first", after="second", max_diffs=1)
         result, _ = test.run("This has firsst and then secand in correct order")
-        self.assertTrue(result)
+        assert result
 
     def test_multiple_occurrences(self):
         """Test that multiple occurrences are handled correctly"""
         test = TextOrderTest(pdf="test.pdf", page=1, id="test_id", type=TestType.ORDER.value, before="target", after="target")
         result, _ = test.run("This has target and then target again")
-        self.assertTrue(result)
+        assert result
 
         # Test reverse direction fails
         test = TextOrderTest(pdf="test.pdf", page=1, id="test_id", type=TestType.ORDER.value, before="B", after="A")
         result, _ = test.run("A B A B")  # A comes before B, but B also comes before second A
-        self.assertTrue(result)
+        assert result
 
 
 class TestTableTest(unittest.TestCase):
     """Test the TableTest class"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.markdown_table = """
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by every test in the class, parsing the fixture tables only once"""
+        cls.markdown_table = """
 | Header 1 | Header 2 | Header 3 |
 | -------- | -------- | -------- |
 | Cell A1  | Cell A2  | Cell A3  |
 | Cell B1  | Cell B2  | Cell B3  |
 """
 
-        self.html_table = """
+        cls.html_table = """
 <table>
   <tr>
     <th>Header 1</th>
@@ -302,126 +327,128 @@ class TestTableTest(unittest.TestCase):
 </table>
 """
 
+        parser = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2")
+        cls.markdown_tables = parser.parse_markdown_tables(cls.markdown_table)
+        cls.html_tables = parser.parse_html_tables(cls.html_table)
+
     def test_valid_initialization(self):
         """Test that valid initialization works"""
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="target cell")
-        self.assertEqual(test.cell, "target cell")
-        self.assertEqual(test.up, "")
-        self.assertEqual(test.down, "")
-        self.assertEqual(test.left, "")
-        self.assertEqual(test.right, "")
-        self.assertEqual(test.top_heading, "")
-        self.assertEqual(test.left_heading, "")
+        assert test.cell == "target cell"
+        assert test.up == ""
+        assert test.down == ""
+        assert test.left == ""
+        assert test.right == ""
+        assert test.top_heading == ""
+        assert test.left_heading == ""
 
     def test_invalid_test_type(self):
         """Test that invalid test type raises ValidationError"""
-        with self.assertRaises(ValidationError):
+        with pytest.raises(ValidationError):
             TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.PRESENT.value, cell="target cell")
 
     def test_parse_markdown_tables(self):
         """Test markdown table parsing"""
-        test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2")
-        tables = test.parse_markdown_tables(self.markdown_table)
-        self.assertEqual(len(tables), 1)
-        self.assertEqual(tables[0].data.shape, (3, 3))  # 3 rows, 3 columns
-        self.assertEqual(tables[0].data[0, 0], "Header 1")
-        self.assertEqual(tables[0].data[1, 1], "Cell A2")
-        self.assertEqual(tables[0].data[2, 2], "Cell B3")
+        tables = self.markdown_tables
+        assert len(tables) == 1
+        assert tables[0].data.shape == (3, 3)  # 3 rows, 3 columns
+        assert tables[0].data[0, 0] == "Header 1"
+        assert tables[0].data[1, 1] == "Cell A2"
+        assert tables[0].data[2, 2] == "Cell B3"
 
     def test_parse_html_tables(self):
         """Test HTML table parsing"""
-        test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2")
-        tables = test.parse_html_tables(self.html_table)
-        self.assertEqual(len(tables), 1)
-        self.assertEqual(tables[0].data.shape, (3, 3))  # 3 rows, 3 columns
-        self.assertEqual(tables[0].data[0, 0], "Header 1")
-        self.assertEqual(tables[0].data[1, 1], "Cell A2")
-        self.assertEqual(tables[0].data[2, 2], "Cell B3")
+        tables = self.html_tables
+        assert len(tables) == 1
+        assert tables[0].data.shape == (3, 3)  # 3 rows, 3 columns
+        assert tables[0].data[0, 0] == "Header 1"
+        assert tables[0].data[1, 1] == "Cell A2"
+        assert tables[0].data[2, 2] == "Cell B3"
 
     def test_match_cell(self):
         """Test finding a cell in a table"""
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2")
         result, _ = test.run(self.markdown_table)
-        self.assertTrue(result)
+        assert result
 
     def test_cell_not_found(self):
         """Test cell not found in table"""
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Missing Cell")
         result, explanation = test.run(self.markdown_table)
-        self.assertFalse(result)
-        self.assertIn("No cell matching", explanation)
+        assert not result
+        assert "No cell matching" in explanation
 
     def test_up_relationship(self):
         """Test up relationship in table"""
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2", up="Header 2")
         result, _ = test.run(self.markdown_table)
-        self.assertTrue(result)
+        assert result
 
         # Test incorrect up relationship
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2", up="Wrong Header")
         result, explanation = test.run(self.markdown_table)
-        self.assertFalse(result)
-        self.assertIn("doesn't match expected", explanation)
+        assert not result
+        assert "doesn't match expected" in explanation
 
     def test_down_relationship(self):
         """Test down relationship in table"""
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2", down="Cell B2")
         result, _ = test.run(self.markdown_table)
-        self.assertTrue(result)
+        assert result
 
         # Test incorrect down relationship
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2", down="Wrong Cell")
         result, explanation = test.run(self.markdown_table)
-        self.assertFalse(result)
-        self.assertIn("doesn't match expected", explanation)
+        assert not result
+        assert "doesn't match expected" in explanation
 
     def test_left_relationship(self):
         """Test left relationship in table"""
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2", left="Cell A1")
         result, _ = test.run(self.markdown_table)
-        self.assertTrue(result)
+        assert result
 
         # Test incorrect left relationship
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2", left="Wrong Cell")
         result, explanation = test.run(self.markdown_table)
-        self.assertFalse(result)
-        self.assertIn("doesn't match expected", explanation)
+        assert not result
+        assert "doesn't match expected" in explanation
 
     def test_right_relationship(self):
         """Test right relationship in table"""
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2", right="Cell A3")
         result, _ = test.run(self.markdown_table)
-        self.assertTrue(result)
+        assert result
 
         # Test incorrect right relationship
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2", right="Wrong Cell")
         result, explanation = test.run(self.markdown_table)
-        self.assertFalse(result)
-        self.assertIn("doesn't match expected", explanation)
+        assert not result
+        assert "doesn't match expected" in explanation
 
     def test_top_heading_relationship(self):
         """Test top_heading relationship in table"""
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell B2", top_heading="Header 2")
         result, _ = test.run(self.markdown_table)
-        self.assertTrue(result)
+        assert result
 
         # Test incorrect top_heading relationship
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell B2", top_heading="Wrong Header")
         result, explanation = test.run(self.markdown_table)
-        self.assertFalse(result)
-        self.assertIn("doesn't match expected", explanation)
+        assert not result
+        assert "doesn't match expected" in explanation
 
     def test_left_heading_relationship(self):
         """Test left_heading relationship in table"""
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A3", left_heading="Cell A1")
         result, _ = test.run(self.markdown_table)
-        self.assertTrue(result)
+        assert result
 
         # Test incorrect left_heading relationship
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A3", left_heading="Wrong Cell")
         result, explanation = test.run(self.markdown_table)
-        self.assertFalse(result)
-        self.assertIn("doesn't match expected", explanation)
+        assert not result
+        assert "doesn't match expected" in explanation
 
     def test_multiple_relationships(self):
         """Test multiple relationships in table"""
@@ -429,7 +456,7 @@ class TestTableTest(unittest.TestCase):
             pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2", up="Header 2", down="Cell B2", left="Cell A1", right="Cell A3"
         )
         result, _ = test.run(self.markdown_table)
-        self.assertTrue(result)
+        assert result
 
         # Test one incorrect relationship
         test = TableTest(
@@ -444,15 +471,44 @@ class TestTableTest(unittest.TestCase):
             right="Cell A3",
         )
         result, explanation = test.run(self.markdown_table)
-        self.assertFalse(result)
-        self.assertIn("doesn't match expected", explanation)
+        assert not result
+        assert "doesn't match expected" in explanation
 
     def test_no_tables_found(self):
         """Test behavior when no tables are found"""
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2")
         result, explanation = test.run("This is plain text with no tables")
-        self.assertFalse(result)
-        self.assertEqual(explanation, "No tables found in the content")
+        assert not result
+        assert explanation == "No tables found in the content"
+
+    def test_repeated_runs_on_same_content(self):
+        """Test that tests sharing the same content get consistent results from the parsed table cache"""
+        passing = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2", up="Header 2")
+        failing = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2", up="Wrong Header")
+
+        for _ in range(3):
+            assert passing.run(self.markdown_table)[0]
+            assert not failing.run(self.markdown_table)[0]
+            assert passing.run(self.html_table)[0]
+
+    def test_parse_html_tables_parser_fallback(self):
+        """Test that content lxml refuses to parse still gets its tables through the BeautifulSoup fallback"""
+        # lxml rejects str input carrying an xml encoding declaration
+        html_content = '<?xml version="1.0" encoding="UTF-8"?>\n' + self.html_table
+        with pytest.raises(ValueError):
+            _extract_html_tables_lxml(html_content)
+
+        test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2", up="Header 2", left="Cell A1")
+        with warnings.catch_warnings():
+            # BeautifulSoup warns about parsing an xml declaration as html
+            warnings.simplefilter("ignore")
+            tables = test.parse_html_tables(html_content)
+            result, explanation = test.run(html_content)
+
+        assert len(tables) == 1
+        assert tables[0].data.shape == (3, 3)
+        assert tables[0].data[1, 1] == "Cell A2"
+        assert result, explanation
 
     def test_fuzzy_matching(self):
         """Test fuzzy matching with max_diffs"""
@@ -460,7 +516,14 @@ class TestTableTest(unittest.TestCase):
         # Create table with slightly misspelled cell
         misspelled_table = self.markdown_table.replace("Cell A2", "Cel A2")
         result, _ = test.run(misspelled_table)
-        self.assertTrue(result)
+        assert result
+
+    def test_fuzzy_matching_at_threshold(self):
+        """Test that a single substitution, whose similarity lands exactly on the max_diffs threshold, still matches"""
+        test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Cell A2", up="Header 2", max_diffs=1)
+        substituted_table = self.markdown_table.replace("Cell A2", "Cell A9")
+        result, explanation = test.run(substituted_table)
+        assert result, explanation
 
     def test_with_stripped_content(self):
         """Test table parsing with stripped content"""
@@ -468,7 +531,7 @@ class TestTableTest(unittest.TestCase):
         # Strip all leading/trailing whitespace from the markdown table
         stripped_table = self.markdown_table.strip()
         result, explanation = test.run(stripped_table)
-        self.assertTrue(result, f"Table test failed with stripped content: {explanation}")
+        assert result, f"Table test failed with stripped content: {explanation}"
 
     def test_table_at_end_of_file(self):
         """Test that a table at the very end of the file is correctly detected"""
@@ -476,7 +539,7 @@ class TestTableTest(unittest.TestCase):
         # Create content with text followed by a table at the very end with no trailing newline
         content_with_table_at_end = "Some text before the table.\n" + self.markdown_table.strip()
         result, explanation = test.run(content_with_table_at_end)
-        self.assertTrue(result, f"Table at end of file not detected: {explanation}")
+        assert result, f"Table at end of file not detected: {explanation}"
 
     def test_table_at_end_with_no_trailing_newline(self):
         """Test that a table at the end with no trailing newline is detected"""
@@ -484,7 +547,7 @@ class TestTableTest(unittest.TestCase):
         # Remove the trailing newline from the markdown table
         content_without_newline = self.markdown_table.rstrip()
         result, explanation = test.run(content_without_newline)
-        self.assertTrue(result, f"Table without trailing newline not detected: {explanation}")
+        assert result, f"Table without trailing newline not detected: {explanation}"
 
     def test_table_at_end_with_extra_spaces(self):
         """Test that a table at the end with extra spaces is detected"""
@@ -493,7 +556,7 @@ class TestTableTest(unittest.TestCase):
         lines = self.markdown_table.split("\n")
         content_with_extra_spaces = "\n".join([line + "   " for line in lines])
         result, explanation = test.run(content_with_extra_spaces)
-        self.assertTrue(result, f"Table with extra spaces not detected: {explanation}")
+        assert result, f"Table with extra spaces not detected: {explanation}"
 
     def test_table_at_end_with_mixed_whitespace(self):
         """Test that a table at the end with mixed whitespace is detected"""
@@ -501,7 +564,7 @@ class TestTableTest(unittest.TestCase):
         # Add various whitespace characters to the table
         content_with_mixed_whitespace = "Some text before the table.\n" + self.markdown_table.strip() + "  \t  "
         result, explanation = test.run(content_with_mixed_whitespace)
-        self.assertTrue(result, f"Table with mixed whitespace not detected: {explanation}")
+        assert result, f"Table with mixed whitespace not detected: {explanation}"
 
     def test_malformed_table_at_end(self):
         """Test that a slightly malformed table at the end is still detected"""
@@ -514,7 +577,7 @@ Some text before the table.
 | Cell A1  | Cell A2  | Cell A3  |
 | Cell B1  | Cell B2  | Cell B3"""
         result, explanation = test.run(malformed_table)
-        self.assertTrue(result, f"Malformed table at end not detected: {explanation}")
+        assert result, f"Malformed table at end not detected: {explanation}"
 
     def test_incomplete_table_at_end(self):
         """Test that an incomplete table at the end still gets detected if it contains valid rows"""
@@ -526,7 +589,7 @@ Some text before the table.
 | Cell A1  | Cell A2  | Cell A3  |
 | Cell B1  | Cell B2  | Cell B3  |"""
         result, explanation = test.run(incomplete_table)
-        self.assertTrue(result, f"Incomplete table at end not detected: {explanation}")
+        assert result, f"Incomplete table at end not detected: {explanation}"
 
     def test_table_with_excessive_blank_lines_at_end(self):
         """Test that a table followed by many blank lines is detected"""
@@ -534,7 +597,7 @@ Some text before the table.
         # Add many blank lines after the table
         table_with_blanks = self.markdown_table + "\n\n\n\n\n\n\n\n\n\n"
         result, explanation = test.run(table_with_blanks)
-        self.assertTrue(result, f"Table with blank lines at end not detected: {explanation}")
+        assert result, f"Table with blank lines at end not detected: {explanation}"
 
     def test_table_at_end_after_long_text(self):
         """Test that a table at the end after a very long text is detected"""
@@ -543,7 +606,7 @@ Some text before the table.
         long_text = "Lorem ipsum dolor sit amet, " * 100
         content_with_long_text = long_text + "\n" + self.markdown_table.strip()
         result, explanation = test.run(content_with_long_text)
-        self.assertTrue(result, f"Table after long text not detected: {explanation}")
+        assert result, f"Table after long text not detected: {explanation}"
 
     def test_valid_table_at_eof_without_newline(self):
         """Test that a valid table at EOF without a trailing newline is detected"""
@@ -555,7 +618,7 @@ Some text before the table.
 | Cell A1  | Cell A2  | Cell A3  |
 | Cell B1  | Cell B2  | Cell B3  |""".strip()
         result, explanation = test.run(valid_table_eof)
-        self.assertTrue(result, f"Valid table at EOF without newline not detected: {explanation}")
+        assert result, f"Valid table at EOF without newline not detected: {explanation}"
 
     def test_normalizing(self):
         table = """| Question - – Satisfaction on scale of 10 | Response | Resident Sample | Business Sample |
@@ -571,7 +634,7 @@ Some text before the table.
 | | Don’t know responses | 1% | 1% |"""
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="6%", top_heading="Business\nSample")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
     def test_mathematical_minus(self):
         table = """| Response | Chinese experimenter | White experimenter |
@@ -582,7 +645,7 @@ Some text before the table.
 """
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="-.34 (.22)")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
     def test_markdown_marker(self):
         table = """| CATEGORY     | POINTS EARNED |
@@ -596,7 +659,7 @@ Some text before the table.
 | TOTAL                        | 46               |"""
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="9", up="POINTS EARNED")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
     def test_markdown_marker2(self):
         table = """| Concentration
@@ -609,7 +672,7 @@ level | [CO]      | [SO2] | [NOx]    |
 | High                   | 1250 μM   | 40 μM | 0.01 nM  |"""
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="20 μM", up=".002 nM")
         result, explanation = test.run(table)
-        self.assertFalse(result, explanation)
+        assert not result, explanation
 
     def test_marker3(self):
         table = """|                                               | N     | Minimum | Maximum | Gemiddelde | Sd  |
@@ -623,7 +686,7 @@ consignatiediensten | 19816 | 1,0     | 6,0     | 2,8        | 1,2 |
             pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="2,8", left_heading="Slaapkwaliteit tijdens\nconsignatiediensten"
         )
         result, explanation = test.run(table)
-        self.assertFalse(result, explanation)
+        assert not result, explanation
 
     def test_big_table(self):
         table = """    <table>
@@ -703,7 +766,7 @@ consignatiediensten | 19816 | 1,0     | 6,0     | 2,8        | 1,2 |
             down="Environmental protection,\nsupport for green projects\n(e.g. green grants,\nbuilding retrofits programs,\nzero waste)",
         )
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
     def test_html_rowspans_colspans(self):
         table = """    <table>
@@ -818,75 +881,75 @@ consignatiediensten | 19816 | 1,0     | 6,0     | 2,8        | 1,2 |
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Refrigerators", left="Home Appliances")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Washing Machines", left="Home Appliances")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Microwaves", left="Home Appliances")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Sofas", top_heading="Product Subcategory")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="135", top_heading="Q3")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="135", top_heading="Quarterly Sales ($000s)")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="1,712", top_heading="Quarterly Sales ($000s)")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="135", top_heading="Q2")
         result, explanation = test.run(table)
-        self.assertFalse(result, explanation)
+        assert not result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="135", top_heading="Q1")
         result, explanation = test.run(table)
-        self.assertFalse(result, explanation)
+        assert not result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="135", top_heading="Q4")
         result, explanation = test.run(table)
-        self.assertFalse(result, explanation)
+        assert not result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Home Appliances", top_heading="Product Category")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Washing Machines", top_heading="Product Category")
         result, explanation = test.run(table)
-        self.assertFalse(result, explanation)
+        assert not result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Washing Machines", top_heading="Q3")
         result, explanation = test.run(table)
-        self.assertFalse(result, explanation)
+        assert not result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Washing Machines", top_heading="Quarterly Sales ($000s)")
         result, explanation = test.run(table)
-        self.assertFalse(result, explanation)
+        assert not result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Electronics", right="Laptops")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Electronics", right="Accessories")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Quarterly Sales ($000s)", down="Q2")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Q2", up="Quarterly Sales ($000s)")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
     def test_multiple_markdown_tables(self):
         """Test that we can find and verify cells in multiple markdown tables in one document"""
@@ -914,29 +977,29 @@ Some text between tables...
         # Test cells in the first table
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="John", right="28")
         result, explanation = test.run(content)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="32", left="Jane")
         result, explanation = test.run(content)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         # Test cells in the second table
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Engineering", right="1.2M")
         result, explanation = test.run(content)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="12", left="1.5M")
         result, explanation = test.run(content)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         # Verify top headings work correctly across tables
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Bob", top_heading="Name")
         result, explanation = test.run(content)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="HR", top_heading="Department")
         result, explanation = test.run(content)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
     def test_multiple_html_tables(self):
         """Test that we can find and verify cells in multiple HTML tables in one document"""
@@ -1015,29 +1078,29 @@ Some text between tables...
         # Test cells in the first table
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="USA", right="Washington DC")
         result, explanation = test.run(content)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="126M", left="Tokyo")
         result, explanation = test.run(content)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         # Test cells in the second table
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="XYZ Inc", right="Healthcare")
         result, explanation = test.run(content)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="15,000", left="$1.8B")
         result, explanation = test.run(content)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         # Verify top headings work correctly across tables
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Tokyo", top_heading="Capital")
         result, explanation = test.run(content)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Finance", top_heading="Industry")
         result, explanation = test.run(content)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
     def test_mixed_markdown_and_html_tables(self):
         """Test that we can find and verify cells in mixed markdown and HTML tables in one document"""
@@ -1083,21 +1146,21 @@ Some text between tables...
         # Test cells in the markdown table
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Orange", right="$0.80")
         result, explanation = test.run(content)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         # Test cells in the HTML table
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="February", right="$12,000")
         result, explanation = test.run(content)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         # Verify we can find cells with specific top headings
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="100", top_heading="Quantity")
         result, explanation = test.run(content)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="$4,800", top_heading="Profit")
         result, explanation = test.run(content)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
     def test_br_tags_replacement(self):
         """Test that <br> and <br/> tags are correctly replaced with newlines"""
@@ -1114,7 +1177,7 @@ Some text between tables...
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="Line 1 Line 2 Line 3")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
     def test_real_complicated_table(self):
         table = """    <table>
@@ -1363,18 +1426,18 @@ Some text between tables...
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="4.39", top_heading="χ2")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="12.88", top_heading="%")
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         # Account for the superscript in the header
         test = TableTest(
             pdf="test.pdf", page=1, id="test_id", type=TestType.TABLE.value, cell="12.88", top_heading="Participants with no suicide attempt (n = 132)a"
         )
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
 
         test = TableTest(
             pdf="test.pdf",
@@ -1385,7 +1448,46 @@ Some text between tables...
             top_heading="Table 1    Differences in diagnoses, gender and family status for participants with a suicide attempt and those without a suicide attempt within the 12-month follow-up interval",
         )
         result, explanation = test.run(table)
-        self.assertTrue(result, explanation)
+        assert result, explanation
+
+
+class TestSimpleHtmlTableScanner(unittest.TestCase):
+    """Test the fast path that scans flat html tables without a full parser"""
+
+    simple_tables = [
+        "<table><tr><th>Name</th><th>Score</th></tr><tr><td>Alice</td><td>90</td></tr></table>",
+        # Whitespace and newlines between the tags, and an empty cell
+        "<table>\n  <tr>\n    <td> Cell A1 </td>\n    <td></td>\n  </tr>\n</table>",
+        # Several tables with markdown around them
+        "Intro text\n\n<table><tr><td>1</td></tr></table>\n\nMiddle text\n\n<table><tr><th>a b</th><td>c</td></tr><tr><td>d</td><td>e</td></tr></table>\n",
+    ]
+
+    bail_out_tables = {
+        "entity": "<table><tr><td>Fish &amp; Chips</td></tr></table>",
+        "attribute": '<table><tr><td colspan="2">Wide</td></tr><tr><td>a</td><td>b</td></tr></table>',
+        "thead": "<table><thead><tr><th>Head</th></tr></thead><tr><td>Body</td></tr></table>",
+        "text between cells": "<table><tr><td>a</td> stray <td>b</td></tr></table>",
+        "text between rows": "<table><tr><td>a</td></tr> stray <tr><td>b</td></tr></table>",
+        "markup in a cell": "<table><tr><td>a<br>b</td><td><b>c</b></td></tr></table>",
+        "nested table": "<table><tr><td><table><tr><td>inner</td></tr></table></td></tr></table>",
+        "other tags outside": "<p>Before</p><table><tr><td>a</td></tr></table>",
+        "unclosed table": "<table><tr><td>a</td></tr>",
+    }
+
+    def test_simple_tables_match_lxml(self):
+        """Test that the scanner takes the fast path on flat tables and extracts exactly what lxml does"""
+        for html in self.simple_tables:
+            with self.subTest(html=html):
+                simple = _extract_html_tables_simple(html)
+                assert simple is not None
+                assert simple == _extract_html_tables_lxml(html)
+
+    def test_bails_out_to_parser(self):
+        """Test that the scanner gives up on anything beyond flat tables of plain text, leaving those to lxml"""
+        for reason, html in self.bail_out_tables.items():
+            with self.subTest(reason=reason):
+                assert _extract_html_tables_simple(html) is None
+                assert _extract_html_tables(html) == _extract_html_tables_lxml(html)
 
 
 class TestBaselineTest(unittest.TestCase):
@@ -1394,20 +1496,20 @@ class TestBaselineTest(unittest.TestCase):
     def test_valid_initialization(self):
         """Test that valid initialization works"""
         test = BaselineTest(pdf="test.pdf", page=1, id="test_id", type=TestType.BASELINE.value, max_repeats=50)
-        self.assertEqual(test.max_repeats, 50)
+        assert test.max_repeats == 50
 
     def test_non_empty_content(self):
         """Test that non-empty content passes"""
         test = BaselineTest(pdf="test.pdf", page=1, id="test_id", type=TestType.BASELINE.value)
         result, _ = test.run("This is some normal content")
-        self.assertTrue(result)
+        assert result
 
     def test_empty_content(self):
         """Test that empty content fails"""
         test = BaselineTest(pdf="test.pdf", page=1, id="test_id", type=TestType.BASELINE.value)
         result, explanation = test.run("   \n\t  ")
-        self.assertFalse(result)
-        self.assertIn("no alpha numeric characters", explanation)
+        assert not result
+        assert "no alpha numeric characters" in explanation
 
     def test_repeating_content(self):
         """Test that highly repeating content fails"""
@@ -1415,116 +1517,191 @@ class TestBaselineTest(unittest.TestCase):
         # Create highly repeating content - repeat "abc" many times
         repeating_content = "abc" * 10
         result, explanation = test.run(repeating_content)
-        self.assertFalse(result)
-        self.assertIn("repeating", explanation)
+        assert not result
+        assert "repeating" in explanation
 
     def test_content_with_disallowed_characters(self):
         """Test that content with disallowed characters fails"""
         test = BaselineTest(pdf="test.pdf", page=1, id="test_id", type=TestType.BASELINE.value)
         result, explanation = test.run("This has Chinese characters: 你好")
-        self.assertFalse(result)
-        self.assertIn("disallowed characters", explanation)
+        assert not result
+        assert "disallowed characters" in explanation
 
     def test_content_with_emoji(self):
         """Test that content with emoji fails"""
         test = BaselineTest(pdf="test.pdf", page=1, id="test_id", type=TestType.BASELINE.value)
         result, explanation = test.run("This has emoji: 😊")
-        self.assertFalse(result)
-        self.assertIn("disallowed characters", explanation)
-        self.assertIn("😊", explanation)
+        assert not result
+        assert "disallowed characters" in explanation
+        assert "😊" in explanation
 
     def test_content_with_mandarin(self):
         test = BaselineTest(pdf="test.pdf", page=1, id="test_id", type=TestType.BASELINE.value)
         result, explanation = test.run("asdfasdfas維基百科/中文asdfw")
-        self.assertFalse(result)
-        self.assertIn("disallowed characters", explanation)
+        assert not result
+        assert "disallowed characters" in explanation
 
     def test_valid_content(self):
         """Test that valid content passes all checks"""
         test = BaselineTest(pdf="test.pdf", page=1, id="test_id", type=TestType.BASELINE.value)
         content = "This is some normal content with proper English letters and no suspicious repetition."
         result, _ = test.run(content)
-        self.assertTrue(result)
+        assert result
+
 
+class TestPageEvaluator(unittest.TestCase):
+    """Test the PageEvaluator class"""
 
-class TestMathTest(unittest.TestCase):
+    def setUp(self):
+        self.tests = [
+            TextPresenceTest(pdf="test.pdf", page=1, id="present_pass", type=TestType.PRESENT.value, text="quick brown"),
+            TextPresenceTest(pdf="test.pdf", page=1, id="present_fail", type=TestType.PRESENT.value, text="slow green"),
+            TextPresenceTest(pdf="test.pdf", page=1, id="absent_pass", type=TestType.ABSENT.value, text="lazy cat"),
+            TextPresenceTest(pdf="test.pdf", page=1, id="absent_fail", type=TestType.ABSENT.value, text="lazy dog"),
+            TextPresenceTest(pdf="test.pdf", page=1, id="case_insensitive", type=TestType.PRESENT.value, text="THE QUICK", case_sensitive=False),
+            TextPresenceTest(pdf="test.pdf", page=1, id="fuzzy", type=TestType.PRESENT.value, text="quick brwn", max_diffs=1),
+            TextPresenceTest(pdf="test.pdf", page=1, id="first_n", type=TestType.PRESENT.value, text="lazy dog", first_n=10),
+            TextOrderTest(pdf="test.pdf", page=1, id="order", type=TestType.ORDER.value, before="quick", after="lazy"),
+        ]
+        self.content = "The quick brown fox jumps over the lazy dog"
+
+    def test_matches_individual_runs(self):
+        """Test that evaluating a page gives the same results as running each test on its own"""
+        evaluator = PageEvaluator(self.tests)
+        results = evaluator.run(self.content)
+
+        assert [test.id for test, _, _, _ in results] == [test.id for test in self.tests]
+        for test, passed, explanation, error in results:
+            assert error is None
+            assert (passed, explanation) == test.run(self.content), test.id
+
+    def test_content_shorter_than_pattern(self):
+        """Test that content shorter than the pattern is still handled like TextPresenceTest.run"""
+        test = TextPresenceTest(pdf="test.pdf", page=1, id="short", type=TestType.PRESENT.value, text="quick brown fox")
+        evaluator = PageEvaluator([test])
+        _, passed, explanation, _ = evaluator.run("brown")[0]
+        assert (passed, explanation) == test.run("brown")
+
+
+def test_save_load_round_trip(tmp_path, monkeypatch):
+    """Test that every test type load_tests reads survives save_tests followed by load_tests unchanged"""
+    # MathTest renders its equation on construction, which needs a browser
+    monkeypatch.setattr(_bench_tests, "render_equation", lambda *args, **kwargs: object())
+
+    common = dict(pdf="test.pdf", page=2, checked=TestChecked.VERIFIED, url="https://example.com/test.pdf")
+    tests = [
+        TextPresenceTest(id="present", type=TestType.PRESENT.value, text="Hello “world”", case_sensitive=False, first_n=100, max_diffs=1, **common),
+        TextPresenceTest(id="absent", type=TestType.ABSENT.value, text="Page 2", last_n=50, **common),
+        TextOrderTest(id="order", type=TestType.ORDER.value, before="First", after="Second", max_diffs=2, **common),
+        TableTest(id="table", type=TestType.TABLE.value, cell="10", up="Price", left="Apples", top_heading="Price", **common),
+        MathTest(id="math", type=TestType.MATH.value, math="a + b = c", **common),
+    ]
+
+    jsonl_file = tmp_path / "tests.jsonl"
+    save_tests(tests, str(jsonl_file))
+
+    # Each line holds exactly the constructor fields of its test, nothing derived
+    for test, line in zip(tests, jsonl_file.read_text(encoding="utf-8").splitlines()):
+        assert set(json.loads(line)) == {f.name for f in fields(test) if f.init}
+
+    loaded = sorted(load_tests(str(jsonl_file)), key=lambda test: test.id)
+    assert loaded == sorted(tests, key=lambda test: test.id)
+    assert [type(test) for test in loaded] == [type(test) for test in sorted(tests, key=lambda test: test.id)]
+
+    # The query is derived, so it is rebuilt on load rather than read back
+    present = next(test for test in loaded if test.id == "present")
+    assert present.query == 'hello "world"'
+
+
+# MathTest renders equations in a headless browser, so these tests swap the renderer out for a stub.
+# MathTest only checks a render against None and hands it to compare_rendered_equations, so any object will do.
+_RENDER_OK = object()
+
+
+@pytest.fixture(scope="module")
+def math_test():
+    """A MathTest for "a + b = c", built once and shared by the tests that only run it"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(_bench_tests, "render_equation", lambda *args, **kwargs: _RENDER_OK)
+        return MathTest(pdf="test.pdf", page=1, id="test_id", type=TestType.MATH.value, math="a + b = c")
+
+
+_DELIM_CONTENTS = (
+    "Here is an equation: $$a + b = c$$",  # $$...$$
+    "Here is an equation: $a + b = c$",  # $...$
+    "Here is an equation: \\(a + b = c\\)",  # \(...\)
+    "Here is an equation: \\[a + b = c\\]",  # \[...\]
+)
+
+
+class TestMathTest:
     """Test the MathTest class"""
 
+    @pytest.fixture(autouse=True)
+    def _patch_render(self, monkeypatch):
+        """Replace render_equation with one that returns the same stub render for every equation"""
+        monkeypatch.setattr(_bench_tests, "render_equation", lambda *args, **kwargs: _RENDER_OK)
+
     def test_valid_initialization(self):
         """Test that valid initialization works"""
-        try:
-            test = MathTest(pdf="test.pdf", page=1, id="test_id", type=TestType.MATH.value, math="a + b = c")
-            self.assertEqual(test.math, "a + b = c")
-        except Exception as e:
-            self.fail(f"Valid initialization failed with: {e}")
+        test = MathTest(pdf="test.pdf", page=1, id="test_id", type=TestType.MATH.value, math="a + b = c")
+        assert test.math == "a + b = c"
 
     def test_invalid_test_type(self):
         """Test that invalid test type raises ValidationError"""
-        with self.assertRaises(ValidationError):
+        with pytest.raises(ValidationError):
             MathTest(pdf="test.pdf", page=1, id="test_id", type=TestType.PRESENT.value, math="a + b = c")
 
     def test_empty_math(self):
         """Test that empty math raises ValidationError"""
-        with self.assertRaises(ValidationError):
+        with pytest.raises(ValidationError):
             MathTest(pdf="test.pdf", page=1, id="test_id", type=TestType.MATH.value, math="")
 
-    def test_exact_math_match(self):
+    def test_render_failure(self, monkeypatch):
+        """Test that an equation which fails to render raises ValidationError"""
+        monkeypatch.setattr(_bench_tests, "render_equation", lambda *args, **kwargs: None)
+        with pytest.raises(ValidationError):
+            MathTest(pdf="test.pdf", page=1, id="test_id", type=TestType.MATH.value, math="a + b = c")
+
+    def test_exact_math_match(self, monkeypatch, math_test):
         """Test exact match of math equation"""
-        try:
-            test = MathTest(pdf="test.pdf", page=1, id="test_id", type=TestType.MATH.value, math="a + b = c")
+        mock_compare = Mock(return_value=False)
+        monkeypatch.setattr(_bench_tests, "compare_rendered_equations", mock_compare)
 
-            # Test content with exact math match
-            content = "Here is an equation: $$a + b = c$$"
-            result, _ = test.run(content)
-            self.assertTrue(result)
-        except Exception as e:
-            self.fail(f"Test failed with: {e}")
+        # Test content with exact math match
+        content = "Here is an equation: $$a + b = c$$"
+        result, _ = math_test.run(content)
+        assert result
+        # An exact match should not need to compare renders
+        mock_compare.assert_not_called()
 
-    def test_rendered_math_match(self):
+    def test_rendered_math_match(self, monkeypatch, math_test):
         """Test rendered match of math equation"""
-        try:
-            test = MathTest(pdf="test.pdf", page=1, id="test_id", type=TestType.MATH.value, math="a + b = c")
+        mock_compare = Mock(return_value=True)
+        monkeypatch.setattr(_bench_tests, "compare_rendered_equations", mock_compare)
 
-            # Test content with different but equivalent math
-            content = "Here is an equation: $$a+b=c$$"
-            result, _ = test.run(content)
-            self.assertTrue(result)
-        except Exception as e:
-            self.fail(f"Test failed with: {e}")
+        # Test content with different but equivalent math
+        content = "Here is an equation: $$a+b=c$$"
+        result, _ = math_test.run(content)
+        assert result
+        mock_compare.assert_called()
 
-    def test_no_math_match(self):
+    def test_no_math_match(self, monkeypatch, math_test):
         """Test no match of math equation"""
-        try:
-            test = MathTest(pdf="test.pdf", page=1, id="test_id", type=TestType.MATH.value, math="a + b = c")
-
-            # Test content with no matching math
-            content = "Here is an equation: $$x + y = z$$"
-            result, explanation = test.run(content)
-            self.assertFalse(result)
-            self.assertIn("No match found", explanation)
-        except Exception as e:
-            self.fail(f"Test failed with: {e}")
-
-    def test_different_math_delimiters(self):
-        """Test different math delimiters"""
-        try:
-            test = MathTest(pdf="test.pdf", page=1, id="test_id", type=TestType.MATH.value, math="a + b = c")
+        monkeypatch.setattr(_bench_tests, "compare_rendered_equations", Mock(return_value=False))
 
-            # Test different delimiters
-            delimiters = [
-                "$$a + b = c$$",  # $$...$$
-                "$a + b = c$",  # $...$
-                "\\(a + b = c\\)",  # \(...\)
-                "\\[a + b = c\\]",  # \[...\]
-            ]
+        # Test content with no matching math
+        content = "Here is an equation: $$x + y = z$$"
+        result, explanation = math_test.run(content)
+        assert not result
+        assert "No match found" in explanation
 
-            for delim in delimiters:
-                content = f"Here is an equation: {delim}"
-                result, _ = test.run(content)
-                self.assertTrue(result)
-        except Exception as e:
-            self.fail(f"Test failed with: {e}")
+    @pytest.mark.parametrize("content", _DELIM_CONTENTS)
+    def test_different_math_delimiters(self, math_test, content):
+        """Test different math delimiters"""
+        result, _ = math_test.run(content)
+        assert result
 
 
 if __name__ == "__main__":
-    unittest.main()
+    sys.exit(pytest.main([__file__]))
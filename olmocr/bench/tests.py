@@ -1,15 +1,22 @@
-import json
+import hashlib
 import os
 import re
+import threading
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import Enum
-from typing import List, Optional, Set, Tuple
+from functools import lru_cache
+from typing import Callable, List, Optional, Set, Tuple
 
+import ahocorasick
+import lxml.html
 import numpy as np
+import orjson
 from bs4 import BeautifulSoup
 from fuzzysearch import find_near_matches
-from rapidfuzz import fuzz
+from lxml.etree import ParserError
+from rapidfuzz import fuzz, process
 from tqdm import tqdm
 
 from olmocr.repeatdetect import RepeatDetector
@@ -27,6 +34,15 @@ class TableData:
     col_headers: dict = field(default_factory=dict)  # Maps column index to header text, handling colspan
     row_headers: dict = field(default_factory=dict)  # Maps row index to header text, handling rowspan
 
+    # Flat row-major views of the cells used for matching: the normalized text of each cell, and a hash of that text
+    # so that exact lookups compare fixed width integers instead of python strings
+    normalized_cells: List[str] = field(init=False, repr=False, compare=False)
+    cell_hashes: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.normalized_cells = [normalize_text(cell) for cell in self.data.ravel()]
+        self.cell_hashes = np.fromiter((hash(cell) for cell in self.normalized_cells), dtype=np.int64, count=len(self.normalized_cells))
+
     def __repr__(self) -> str:
         """Returns a concise representation of the TableData object for debugging."""
         return f"TableData(shape={self.data.shape}, header_rows={len(self.header_rows)}, header_cols={len(self.header_cols)})"
@@ -89,6 +105,40 @@ class TableData:
         return "\n".join(output)
 
 
+# Parsed tables keyed by (parser kind, content digest). Many TableTests run against the same page, so the same
+# content gets parsed over and over; hashing it is much cheaper than re-running the parsers.
+_TABLE_CACHE_MAX_SIZE = 256
+_table_cache: "OrderedDict[Tuple[str, bytes], List[TableData]]" = OrderedDict()
+_table_cache_lock = threading.Lock()
+
+
+def _cached_parse_tables(kind: str, content: str, parse_fn: Callable[[str], List[TableData]]) -> List[TableData]:
+    """
+    Returns parse_fn(content), reusing a previous result for identical content if one is cached.
+    The cache is keyed on a digest of the content so that large pages are not kept alive by the cache keys.
+    """
+    key = (kind, hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest())
+
+    with _table_cache_lock:
+        tables = _table_cache.get(key)
+        if tables is not None:
+            _table_cache.move_to_end(key)
+            return list(tables)
+
+    tables = parse_fn(content)
+
+    # Cached tables are shared between tests, so make sure nobody modifies them in place
+    for table in tables:
+        table.data.setflags(write=False)
+
+    with _table_cache_lock:
+        _table_cache[key] = tables
+        while len(_table_cache) > _TABLE_CACHE_MAX_SIZE:
+            _table_cache.popitem(last=False)
+
+    return list(tables)
+
+
 class TestType(str, Enum):
     BASELINE = "baseline"
     PRESENT = "present"
@@ -103,38 +153,266 @@ class TestChecked(str, Enum):
     REJECTED = "rejected"
 
 
+_TEST_TYPE_VALUES = frozenset(t.value for t in TestType)
+
+
 class ValidationError(Exception):
     """Exception raised for validation errors."""
 
     pass
 
 
+_WHITESPACE_RE = re.compile(r"\s+")
+_MD_BOLD_STAR_RE = re.compile(r"\*\*(.*?)\*\*")
+_MD_BOLD_UNDERSCORE_RE = re.compile(r"__(.*?)__")
+_MD_ITALIC_STAR_RE = re.compile(r"\*(.*?)\*")
+_MD_ITALIC_UNDERSCORE_RE = re.compile(r"_(.*?)_")
+
+# Translation table of characters to replace: keys are fancy characters, values are ASCII equivalents, unicode micro with greek mu comes up often enough too
+_FANCY_CHAR_TRANS = str.maketrans(
+    {"‘": "'", "’": "'", "‚": "'", "“": '"', "”": '"', "„": '"', "＿": "_", "–": "-", "—": "-", "‑": "-", "‒": "-", "−": "-", "\u00b5": "\u03bc"}
+)
+
+
 def normalize_text(md_content: str) -> str:
     if md_content is None:
         return None
 
     # Normalize whitespace in the md_content
-    md_content = re.sub(r"\s+", " ", md_content)
+    md_content = _WHITESPACE_RE.sub(" ", md_content)
 
     # Remove markdown bold formatting (** or __ for bold)
-    md_content = re.sub(r"\*\*(.*?)\*\*", r"\1", md_content)
-    md_content = re.sub(r"__(.*?)__", r"\1", md_content)
+    md_content = _MD_BOLD_STAR_RE.sub(r"\1", md_content)
+    md_content = _MD_BOLD_UNDERSCORE_RE.sub(r"\1", md_content)
 
     # Remove markdown italics formatting (* or _ for italics)
-    md_content = re.sub(r"\*(.*?)\*", r"\1", md_content)
-    md_content = re.sub(r"_(.*?)_", r"\1", md_content)
+    md_content = _MD_ITALIC_STAR_RE.sub(r"\1", md_content)
+    md_content = _MD_ITALIC_UNDERSCORE_RE.sub(r"\1", md_content)
+
+    # Apply all character replacements in a single pass, this has to stay after the markdown stripping above
+    # so that fullwidth underscores are not treated as italics markers. All of the replaced characters are non-ASCII,
+    # so the common pure ASCII content can skip the pass entirely (isascii() is a flag check on the string object)
+    if md_content.isascii():
+        return md_content
+
+    return md_content.translate(_FANCY_CHAR_TRANS)
+
+
+@lru_cache(maxsize=64)
+def _normalized_content(md_content: str, lowercase: bool, /) -> str:
+    """
+    Returns normalize_text(md_content), lowercased if requested.
+    The benchmark runs many text tests against each page, so caching this saves renormalizing the same page for every test.
+    Both arguments are positional only, since lru_cache keys positional and keyword calls differently.
+    """
+    md_content = normalize_text(md_content)
+    return md_content.lower() if lowercase else md_content
+
+
+@lru_cache(maxsize=4096)
+def _cell_similarity(expected: str, actual: str) -> float:
+    """
+    fuzz.ratio(expected, actual) / 100, memoized since table tests keep comparing the same expected strings against the
+    same header and neighbor cells (for every matching cell, and again for every repeat with an identical table).
+    """
+    return fuzz.ratio(expected, actual) / 100.0
+
+
+def _ratio_upper_bound(a: str, b: str) -> float:
+    """
+    Cheap upper bound on fuzz.ratio(a, b) / 100 computed from the string lengths alone, since turning one string into the
+    other takes at least as many edits as their difference in length. A tiny slack absorbs float rounding differences.
+    """
+    total_len = len(a) + len(b)
+    if total_len == 0:
+        return 1.0
+    return 1.0 - abs(len(a) - len(b)) / total_len + 1e-9
+
+
+# A markdown table separator row: once pipes and surrounding whitespace are removed, only dashes, colons and spaces remain
+_MD_TABLE_SEPARATOR_RE = re.compile(r"[\s|]*[-:][- :|]*[\s|]*")
+
+# A markdown table line made up entirely of formatting characters
+_MD_TABLE_FORMATTING_RE = re.compile(r"[- :|]*[-:|][- :|]*")
+
+_HTML_TABLE_TAG_RE = re.compile(r"<table", re.IGNORECASE)
+
+
+@dataclass
+class _HtmlCell:
+    """A single <td> or <th> cell as extracted from the html, before any rowspan/colspan layout is applied."""
+
+    tag: str
+    text: str
+    rowspan: int = 1
+    colspan: int = 1
+
+
+@dataclass
+class _HtmlTable:
+    """The raw rows of an html <table>, along with the indices of the rows that sit inside its <thead>."""
+
+    rows: List[List[_HtmlCell]]
+    thead_rows: Set[int] = field(default_factory=set)
+
+
+# States of the simple html table scanner
+_HTML_OUTSIDE_TABLE, _HTML_IN_TABLE, _HTML_IN_ROW, _HTML_IN_CELL = range(4)
+
+
+def _extract_html_tables_simple(html_content: str) -> Optional[List[_HtmlTable]]:
+    """
+    Fast path for flat tables built only from bare <table>, <tr>, <th> and <td> tags holding plain text, which is what
+    most generated html tables look like. Walks the tags with str.find instead of building a document tree.
+
+    Returns None as soon as it sees anything else (attributes, other tags, entities, nesting, stray text between cells),
+    so that the caller can fall back to a real html parser.
+    """
+    if "&" in html_content or "\r" in html_content or "\x00" in html_content:
+        return None
+
+    tables = []
+    rows: List[List[_HtmlCell]] = []
+    cells: List[_HtmlCell] = []
+    cell_tag = ""
+    state = _HTML_OUTSIDE_TABLE
+    pos = 0
+
+    while True:
+        tag_start = html_content.find("<", pos)
+        if tag_start == -1:
+            break
+        tag_end = html_content.find(">", tag_start)
+        if tag_end == -1:
+            return None
+
+        tag = html_content[tag_start + 1 : tag_end]
+        text = html_content[pos:tag_start]
+
+        if state == _HTML_OUTSIDE_TABLE:
+            if tag != "table":
+                return None
+            rows = []
+            state = _HTML_IN_TABLE
+        elif state == _HTML_IN_TABLE:
+            if text.strip():
+                return None
+            if tag == "tr":
+                cells = []
+                state = _HTML_IN_ROW
+            elif tag == "/table":
+                tables.append(_HtmlTable(rows=rows))
+                state = _HTML_OUTSIDE_TABLE
+            else:
+                return None
+        elif state == _HTML_IN_ROW:
+            if text.strip():
+                return None
+            if tag == "td" or tag == "th":
+                cell_tag = tag
+                state = _HTML_IN_CELL
+            elif tag == "/tr":
+                rows.append(cells)
+                state = _HTML_IN_TABLE
+            else:
+                return None
+        else:
+            if tag != "/" + cell_tag:
+                return None
+            cells.append(_HtmlCell(tag=cell_tag, text=text.strip()))
+            state = _HTML_IN_ROW
+
+        pos = tag_end + 1
+
+    if state != _HTML_OUTSIDE_TABLE:
+        return None
+
+    return tables
+
+
+def _extract_html_tables_lxml(html_content: str) -> List[_HtmlTable]:
+    root = lxml.html.fromstring(html_content)
 
-    # Dictionary of characters to replace: keys are fancy characters, values are ASCII equivalents, unicode micro with greek mu comes up often enough too
-    replacements = {"‘": "'", "’": "'", "‚": "'", "“": '"', "”": '"', "„": '"', "＿": "_", "–": "-", "—": "-", "‑": "-", "‒": "-", "−": "-", "\u00b5": "\u03bc"}
+    # Replace <br> and <br/> tags with newlines before getting text
+    for br in root.iter("br"):
+        br.tail = "\n" + (br.tail or "")
 
-    # Apply all replacements from the dictionary
-    for fancy_char, ascii_char in replacements.items():
-        md_content = md_content.replace(fancy_char, ascii_char)
+    tables = []
+    for table in root.iter("table"):
+        rows = list(table.iter("tr"))
+        row_indices = {id(tr): idx for idx, tr in enumerate(rows)}
 
-    return md_content
+        # Find rows inside thead tags - these are definitely header rows
+        thead_rows = set()
+        thead = next(table.iter("thead"), None)
+        if thead is not None:
+            thead_rows = {row_indices[id(tr)] for tr in thead.iter("tr")}
 
+        raw_rows = []
+        for row in rows:
+            raw_rows.append(
+                [
+                    _HtmlCell(tag=cell.tag, text=cell.text_content().strip(), rowspan=int(cell.get("rowspan", 1)), colspan=int(cell.get("colspan", 1)))
+                    for cell in row.iter("th", "td")
+                ]
+            )
 
-@dataclass(kw_only=True)
+        tables.append(_HtmlTable(rows=raw_rows, thead_rows=thead_rows))
+
+    return tables
+
+
+def _extract_html_tables_bs4(html_content: str) -> List[_HtmlTable]:
+    soup = BeautifulSoup(html_content, "html.parser")
+
+    # Replace <br> and <br/> tags with newlines before getting text
+    for br in soup.find_all("br"):
+        br.replace_with("\n")
+
+    tables = []
+    for table in soup.find_all("table"):
+        rows = table.find_all(["tr"])
+
+        # Find rows inside thead tags - these are definitely header rows
+        thead_rows = set()
+        thead = table.find("thead")
+        if thead:
+            thead_rows = {rows.index(tr) for tr in thead.find_all("tr")}
+
+        raw_rows = []
+        for row in rows:
+            raw_rows.append(
+                [
+                    _HtmlCell(tag=cell.name, text=cell.get_text().strip(), rowspan=int(cell.get("rowspan", 1)), colspan=int(cell.get("colspan", 1)))
+                    for cell in row.find_all(["th", "td"])
+                ]
+            )
+
+        tables.append(_HtmlTable(rows=raw_rows, thead_rows=thead_rows))
+
+    return tables
+
+
+def _extract_html_tables(html_content: str) -> List[_HtmlTable]:
+    """
+    Pulls the raw cell contents out of every <table> in the given content.
+    Simple flat tables are scanned directly, anything else is parsed with lxml, which is much faster than BeautifulSoup,
+    and only falls back to BeautifulSoup if lxml can't parse the content.
+    """
+    if not _HTML_TABLE_TAG_RE.search(html_content):
+        return []
+
+    simple_tables = _extract_html_tables_simple(html_content)
+    if simple_tables is not None:
+        return simple_tables
+
+    try:
+        return _extract_html_tables_lxml(html_content)
+    except (ParserError, ValueError):
+        return _extract_html_tables_bs4(html_content)
+
+
+@dataclass(kw_only=True, slots=True)
 class BasePDFTest:
     """
     Base class for all PDF test types.
@@ -156,14 +434,14 @@ class BasePDFTest:
     url: Optional[str] = None
 
     def __post_init__(self):
+        if self.type not in _TEST_TYPE_VALUES:
+            raise ValidationError(f"Invalid test type: {self.type}")
         if not self.pdf:
             raise ValidationError("PDF filename cannot be empty")
         if not self.id:
             raise ValidationError("Test ID cannot be empty")
         if not isinstance(self.max_diffs, int) or self.max_diffs < 0:
             raise ValidationError("Max diffs must be positive number or 0")
-        if self.type not in {t.value for t in TestType}:
-            raise ValidationError(f"Invalid test type: {self.type}")
 
     def run(self, md_content: str) -> Tuple[bool, str]:
         """
@@ -179,7 +457,7 @@ class BasePDFTest:
         raise NotImplementedError("Subclasses must implement the run method")
 
 
-@dataclass
+@dataclass(slots=True)
 class TextPresenceTest(BasePDFTest):
     """
     Test to verify the presence or absence of specific text in a PDF.
@@ -193,39 +471,73 @@ class TextPresenceTest(BasePDFTest):
     first_n: Optional[int] = None
     last_n: Optional[int] = None
 
+    # The text as it is searched for, lowercased for case insensitive tests
+    query: str = field(init=False, repr=False, compare=False)
+
+    # The run implementation specialized for this test's settings, chosen once at construction
+    run_impl: Callable[["TextPresenceTest", str], Tuple[bool, str]] = field(init=False, repr=False, compare=False)
+
     def __post_init__(self):
-        super().__post_init__()
+        super(TextPresenceTest, self).__post_init__()
         if self.type not in {TestType.PRESENT.value, TestType.ABSENT.value}:
             raise ValidationError(f"Invalid type for TextPresenceTest: {self.type}")
         self.text = normalize_text(self.text)
         if not self.text.strip():
             raise ValidationError("Text field cannot be empty")
+        self.query = self.text if self.case_sensitive else self.text.lower()
+        self.run_impl = TextPresenceTest._run_exact if self.max_diffs == 0 else TextPresenceTest._run_fuzzy
 
     def run(self, md_content: str) -> Tuple[bool, str]:
-        reference_query = self.text
-
-        # Normalize whitespace in the md_content
-        md_content = normalize_text(md_content)
-
-        if not self.case_sensitive:
-            reference_query = reference_query.lower()
-            md_content = md_content.lower()
+        # Normalize whitespace in the md_content, lowercasing it too for case insensitive tests
+        return self.run_impl(self, self._window(_normalized_content(md_content, not self.case_sensitive)))
 
+    def _window(self, md_content: str) -> str:
         if self.first_n and self.last_n:
-            md_content = md_content[: self.first_n] + md_content[-self.last_n :]
+            return md_content[: self.first_n] + md_content[-self.last_n :]
         elif self.first_n:
-            md_content = md_content[: self.first_n]
+            return md_content[: self.first_n]
         elif self.last_n:
-            md_content = md_content[-self.last_n :]
+            return md_content[-self.last_n :]
+        return md_content
+
+    def _run_exact(self, md_content: str) -> Tuple[bool, str]:
+        reference_query = self.query
+
+        # With no diffs allowed the threshold is a perfect partial match, and plain substring search finds those much more cheaply than any alignment.
+        # A content shorter than the query can still match perfectly by being contained in it, which only the alignment detects.
+        if reference_query in md_content:
+            best_ratio = 1.0
+        else:
+            best_ratio = fuzz.partial_ratio(reference_query, md_content, score_cutoff=100.0 - 1e-6) / 100.0
+
+        return self._result(reference_query, md_content, best_ratio, 1.0)
+
+    def _run_fuzzy(self, md_content: str) -> Tuple[bool, str]:
+        reference_query = self.query
 
         # Threshold for fuzzy matching derived from max_diffs
         threshold = 1.0 - (self.max_diffs / (len(reference_query) if len(reference_query) > 0 else 1))
-        best_ratio = fuzz.partial_ratio(reference_query, md_content) / 100.0
+
+        # Passing score_cutoff lets rapidfuzz stop aligning as soon as no window can reach the threshold,
+        # in which case it reports 0. The small epsilon keeps float rounding from rejecting exact-threshold scores.
+        score_cutoff = max(threshold * 100.0 - 1e-6, 0.0)
+
+        # An exact occurrence is a perfect partial match, and plain substring search is much cheaper than any alignment
+        if reference_query in md_content:
+            best_ratio = 1.0
+        else:
+            best_ratio = fuzz.partial_ratio(reference_query, md_content, score_cutoff=score_cutoff) / 100.0
+
+        return self._result(reference_query, md_content, best_ratio, threshold)
+
+    def _result(self, reference_query: str, md_content: str, best_ratio: float, threshold: float) -> Tuple[bool, str]:
 
         if self.type == TestType.PRESENT.value:
             if best_ratio >= threshold:
                 return True, ""
             else:
+                # Only pay for the full alignment when we need the real ratio for the failure message
+                best_ratio = fuzz.partial_ratio(reference_query, md_content) / 100.0
                 msg = f"Expected '{reference_query[:40]}...' with threshold {threshold} " f"but best match ratio was {best_ratio:.3f}"
                 return False, msg
         else:  # ABSENT
@@ -236,7 +548,7 @@ class TextPresenceTest(BasePDFTest):
                 return False, msg
 
 
-@dataclass
+@dataclass(slots=True)
 class TextOrderTest(BasePDFTest):
     """
     Test to verify that one text appears before another in a PDF.
@@ -250,7 +562,7 @@ class TextOrderTest(BasePDFTest):
     after: str
 
     def __post_init__(self):
-        super().__post_init__()
+        super(TextOrderTest, self).__post_init__()
         if self.type != TestType.ORDER.value:
             raise ValidationError(f"Invalid type for TextOrderTest: {self.type}")
         self.before = normalize_text(self.before)
@@ -261,10 +573,14 @@ class TextOrderTest(BasePDFTest):
             raise ValidationError("After field cannot be empty")
 
     def run(self, md_content: str) -> Tuple[bool, str]:
-        md_content = normalize_text(md_content)
+        md_content = _normalized_content(md_content, False)
+
+        if self.max_diffs == 0:
+            return self._run_exact(md_content)
 
-        before_matches = find_near_matches(self.before, md_content, max_l_dist=self.max_diffs)
-        after_matches = find_near_matches(self.after, md_content, max_l_dist=self.max_diffs)
+        # A match needs at least len(text) - max_diffs characters, so skip the fuzzy search when the content is too short
+        before_matches = find_near_matches(self.before, md_content, max_l_dist=self.max_diffs) if len(md_content) >= len(self.before) - self.max_diffs else []
+        after_matches = find_near_matches(self.after, md_content, max_l_dist=self.max_diffs) if len(md_content) >= len(self.after) - self.max_diffs else []
 
         if not before_matches:
             return False, f"'before' text '{self.before[:40]}...' not found with max_l_dist {self.max_diffs}"
@@ -277,8 +593,25 @@ class TextOrderTest(BasePDFTest):
                     return True, ""
         return False, (f"Could not find a location where '{self.before[:40]}...' appears before " f"'{self.after[:40]}...'.")
 
+    def _run_exact(self, md_content: str) -> Tuple[bool, str]:
+        """
+        Exact matching version of run using str.find. The earliest 'before' occurrence is the best candidate, so the test
+        passes if an 'after' occurrence starts anywhere past it (overlaps allowed, same as the fuzzy search).
+        """
+        before_start = md_content.find(self.before)
+        if before_start == -1:
+            return False, f"'before' text '{self.before[:40]}...' not found with max_l_dist {self.max_diffs}"
 
-@dataclass
+        if md_content.find(self.after, before_start + 1) != -1:
+            return True, ""
+
+        if md_content.find(self.after) == -1:
+            return False, f"'after' text '{self.after[:40]}...' not found with max_l_dist {self.max_diffs}"
+
+        return False, (f"Could not find a location where '{self.before[:40]}...' appears before " f"'{self.after[:40]}...'.")
+
+
+@dataclass(slots=True)
 class TableTest(BasePDFTest):
     """
     Test to verify certain properties of a table are held, namely that some cells appear relative to other cells correctly
@@ -298,7 +631,7 @@ class TableTest(BasePDFTest):
     left_heading: str = ""
 
     def __post_init__(self):
-        super().__post_init__()
+        super(TableTest, self).__post_init__()
         if self.type != TestType.TABLE.value:
             raise ValidationError(f"Invalid type for TableTest: {self.type}")
 
@@ -323,103 +656,78 @@ class TableTest(BasePDFTest):
         Returns:
             A list of TableData objects, each containing the table data and header information
         """
-        import numpy as np
-
         # Split the content into lines and process line by line
         lines = md_content.strip().split("\n")
 
         parsed_tables = []
         current_table_lines = []
-        in_table = False
 
         # Identify potential tables by looking for lines with pipe characters
-        for i, line in enumerate(lines):
+        for line in lines:
             # Check if this line has pipe characters (a table row indicator)
             if "|" in line:
-                # If we weren't in a table before, start a new one
-                if not in_table:
-                    in_table = True
-                    current_table_lines = [line]
-                else:
-                    # Continue adding to the current table
-                    current_table_lines.append(line)
-            else:
+                current_table_lines.append(line)
+            elif current_table_lines:
                 # No pipes in this line, so if we were in a table, we've reached its end
-                if in_table:
-                    # Process the completed table if it has at least 2 rows
-                    if len(current_table_lines) >= 2:
-                        table_data = self._process_table_lines(current_table_lines)
-                        if table_data and len(table_data) > 0:
-                            # Convert to numpy array for easier manipulation
-                            max_cols = max(len(row) for row in table_data)
-                            padded_data = [row + [""] * (max_cols - len(row)) for row in table_data]
-                            table_array = np.array(padded_data)
-
-                            # In markdown tables, the first row is typically a header row
-                            header_rows = {0} if len(table_array) > 0 else set()
-
-                            # Set up col_headers with first row headers for each column
-                            col_headers = {}
-                            if len(table_array) > 0:
-                                for col_idx in range(table_array.shape[1]):
-                                    if col_idx < len(table_array[0]):
-                                        col_headers[col_idx] = [(0, table_array[0, col_idx])]
-
-                            # Set up row_headers with first column headers for each row
-                            row_headers = {}
-                            if table_array.shape[1] > 0:
-                                for row_idx in range(1, table_array.shape[0]):  # Skip header row
-                                    row_headers[row_idx] = [(0, table_array[row_idx, 0])]  # First column as heading
-
-                            # Create TableData object
-                            parsed_tables.append(
-                                TableData(
-                                    data=table_array,
-                                    header_rows=header_rows,
-                                    header_cols={0} if table_array.shape[1] > 0 else set(),  # First column as header
-                                    col_headers=col_headers,
-                                    row_headers=row_headers,
-                                )
-                            )
-                    in_table = False
+                table = self._build_markdown_table(current_table_lines)
+                if table is not None:
+                    parsed_tables.append(table)
+                current_table_lines = []
 
         # Process the last table if we're still tracking one at the end of the file
-        if in_table and len(current_table_lines) >= 2:
-            table_data = self._process_table_lines(current_table_lines)
-            if table_data and len(table_data) > 0:
-                # Convert to numpy array
-                max_cols = max(len(row) for row in table_data)
-                padded_data = [row + [""] * (max_cols - len(row)) for row in table_data]
-                table_array = np.array(padded_data)
+        if current_table_lines:
+            table = self._build_markdown_table(current_table_lines)
+            if table is not None:
+                parsed_tables.append(table)
 
-                # In markdown tables, the first row is typically a header row
-                header_rows = {0} if len(table_array) > 0 else set()
+        return parsed_tables
 
-                # Set up col_headers with first row headers for each column
-                col_headers = {}
-                if len(table_array) > 0:
-                    for col_idx in range(table_array.shape[1]):
-                        if col_idx < len(table_array[0]):
-                            col_headers[col_idx] = [(0, table_array[0, col_idx])]
+    def _build_markdown_table(self, table_lines: List[str]) -> Optional[TableData]:
+        """
+        Turn the lines of a single markdown table into a TableData object.
 
-                # Set up row_headers with first column headers for each row
-                row_headers = {}
-                if table_array.shape[1] > 0:
-                    for row_idx in range(1, table_array.shape[0]):  # Skip header row
-                        row_headers[row_idx] = [(0, table_array[row_idx, 0])]  # First column as heading
+        Args:
+            table_lines: List of consecutive lines containing pipe characters
 
-                # Create TableData object
-                parsed_tables.append(
-                    TableData(
-                        data=table_array,
-                        header_rows=header_rows,
-                        header_cols={0} if table_array.shape[1] > 0 else set(),  # First column as header
-                        col_headers=col_headers,
-                        row_headers=row_headers,
-                    )
-                )
+        Returns:
+            A TableData object, or None if the lines don't form a table with at least two rows
+        """
+        # Process the completed table if it has at least 2 rows
+        if len(table_lines) < 2:
+            return None
 
-        return parsed_tables
+        table_data = self._process_table_lines(table_lines)
+        if not table_data:
+            return None
+
+        # Convert to numpy array for easier manipulation
+        max_cols = max(len(row) for row in table_data)
+        padded_data = [row + [""] * (max_cols - len(row)) for row in table_data]
+        table_array = np.array(padded_data)
+
+        # In markdown tables, the first row is typically a header row
+        header_rows = {0} if len(table_array) > 0 else set()
+
+        # Set up col_headers with first row headers for each column
+        col_headers = {}
+        if len(table_array) > 0:
+            for col_idx in range(table_array.shape[1]):
+                if col_idx < len(table_array[0]):
+                    col_headers[col_idx] = [(0, table_array[0, col_idx])]
+
+        # Set up row_headers with first column headers for each row
+        row_headers = {}
+        if table_array.shape[1] > 0:
+            for row_idx in range(1, table_array.shape[0]):  # Skip header row
+                row_headers[row_idx] = [(0, table_array[row_idx, 0])]  # First column as heading
+
+        return TableData(
+            data=table_array,
+            header_rows=header_rows,
+            header_cols={0} if table_array.shape[1] > 0 else set(),  # First column as header
+            col_headers=col_headers,
+            row_headers=row_headers,
+        )
 
     def _process_table_lines(self, table_lines: List[str]) -> List[List[str]]:
         """
@@ -436,9 +744,7 @@ class TableTest(BasePDFTest):
 
         # First, identify the separator row (the row with dashes)
         for i, line in enumerate(table_lines):
-            # Check if this looks like a separator row (contains mostly dashes)
-            content_without_pipes = line.replace("|", "").strip()
-            if content_without_pipes and all(c in "- :" for c in content_without_pipes):
+            if _MD_TABLE_SEPARATOR_RE.fullmatch(line):
                 separator_row_index = i
                 break
 
@@ -449,7 +755,7 @@ class TableTest(BasePDFTest):
                 continue
 
             # Skip lines that are entirely formatting
-            if line.strip() and all(c in "- :|" for c in line):
+            if _MD_TABLE_FORMATTING_RE.fullmatch(line):
                 continue
 
             # Process the cells in this row
@@ -477,39 +783,28 @@ class TableTest(BasePDFTest):
         Returns:
             A list of TableData objects, each containing the table data and header information
         """
-        soup = BeautifulSoup(html_content, "html.parser")
-        tables = soup.find_all("table")
-
         parsed_tables = []
 
-        for table in tables:
-            rows = table.find_all(["tr"])
+        for raw_table in _extract_html_tables(html_content):
+            rows = raw_table.rows
             table_data = []
-            header_rows = set()
+            header_rows = set(raw_table.thead_rows)
             header_cols = set()
             col_headers = {}  # Maps column index to all header cells above it
             row_headers = {}  # Maps row index to all header cells to its left
 
-            # Find rows inside thead tags - these are definitely header rows
-            thead = table.find("thead")
-            if thead:
-                thead_rows = thead.find_all("tr")
-                for tr in thead_rows:
-                    header_rows.add(rows.index(tr))
-
             # Initialize a grid to track filled cells due to rowspan/colspan
             cell_grid = {}
             col_span_info = {}  # Tracks which columns contain headers
             row_span_info = {}  # Tracks which rows contain headers
 
             # First pass: process each row to build the raw table data and identify headers
-            for row_idx, row in enumerate(rows):
-                cells = row.find_all(["th", "td"])
+            for row_idx, cells in enumerate(rows):
                 row_data = []
                 col_idx = 0
 
                 # If there are th elements in this row, it's likely a header row
-                if row.find("th"):
+                if any(cell.tag == "th" for cell in cells):
                     header_rows.add(row_idx)
 
                 for cell in cells:
@@ -518,14 +813,9 @@ class TableTest(BasePDFTest):
                         row_data.append(cell_grid[(row_idx, col_idx)])
                         col_idx += 1
 
-                    # Replace <br> and <br/> tags with newlines before getting text
-                    for br in cell.find_all("br"):
-                        br.replace_with("\n")
-                    cell_text = cell.get_text().strip()
-
-                    # Handle rowspan/colspan
-                    rowspan = int(cell.get("rowspan", 1))
-                    colspan = int(cell.get("colspan", 1))
+                    cell_text = cell.text
+                    rowspan = cell.rowspan
+                    colspan = cell.colspan
 
                     # Add the cell to the row data
                     row_data.append(cell_text)
@@ -542,7 +832,7 @@ class TableTest(BasePDFTest):
                                 cell_grid[(row_idx + i, col_idx + j)] = ""  # Mark other spans as empty
 
                     # If this is a header cell (th), mark it and its span
-                    if cell.name == "th":
+                    if cell.tag == "th":
                         # Mark columns as header columns
                         for j in range(colspan):
                             header_cols.add(col_idx + j)
@@ -573,7 +863,7 @@ class TableTest(BasePDFTest):
                                 row_span_info[cell_text].add(row_idx + i)
 
                     # Also handle row headers from data cells that have rowspan
-                    if cell.name == "td" and rowspan > 1 and col_idx in header_cols:
+                    if cell.tag == "td" and rowspan > 1 and col_idx in header_cols:
                         for i in range(1, rowspan):
                             if row_idx + i < len(rows):
                                 if row_idx + i not in row_headers:
@@ -657,10 +947,10 @@ class TableTest(BasePDFTest):
         threshold = 1.0 - (self.max_diffs / (len(self.cell) if len(self.cell) > 0 else 1))
 
         # Parse tables based on content_type
-        md_tables = self.parse_markdown_tables(content)
+        md_tables = _cached_parse_tables("markdown", content, self.parse_markdown_tables)
         tables_to_check.extend(md_tables)
 
-        html_tables = self.parse_html_tables(content)
+        html_tables = _cached_parse_tables("html", content, self.parse_html_tables)
         tables_to_check.extend(html_tables)
 
         # If no tables found, return failure
@@ -674,15 +964,21 @@ class TableTest(BasePDFTest):
             header_rows = table_data.header_rows
             header_cols = table_data.header_cols
 
-            # Find all cells that match the target cell using fuzzy matching
-            matches = []
-            for i in range(table_array.shape[0]):
-                for j in range(table_array.shape[1]):
-                    cell_content = normalize_text(table_array[i, j])
-                    similarity = fuzz.ratio(self.cell, cell_content) / 100.0
+            # Cells are normalized once when the table is parsed, the neighbor checks below reuse these
+            num_rows, num_cols = table_array.shape
+            normalized_cells = table_data.normalized_cells
+
+            if self.max_diffs == 0:
+                # Only an identical cell can reach a ratio of 1.0, so compare hashes and then confirm to rule out collisions
+                candidates = np.flatnonzero(table_data.cell_hashes == hash(self.cell))
+                match_indices = [flat_idx for flat_idx in candidates if normalized_cells[flat_idx] == self.cell]
+            else:
+                # Find all cells that match the target cell using fuzzy matching, scoring the whole table in one call.
+                # No score_cutoff here: cdist zeroes scores that land exactly on the cutoff, so the threshold is applied below instead
+                similarities = process.cdist([self.cell], normalized_cells, scorer=fuzz.ratio, dtype=np.float64)[0] / 100.0
+                match_indices = np.flatnonzero(similarities >= threshold)
 
-                    if similarity >= threshold:
-                        matches.append((i, j))
+            matches = [divmod(int(flat_idx), num_cols) for flat_idx in match_indices]
 
             # If no matches found in this table, continue to the next table
             if not matches:
@@ -695,24 +991,24 @@ class TableTest(BasePDFTest):
 
                 # Check up relationship
                 if self.up and row_idx > 0:
-                    up_cell = normalize_text(table_array[row_idx - 1, col_idx])
-                    up_similarity = fuzz.ratio(self.up, up_cell) / 100.0
+                    up_cell = normalized_cells[(row_idx - 1) * num_cols + col_idx]
+                    up_similarity = _cell_similarity(self.up, up_cell)
                     if up_similarity < threshold:
                         all_relationships_satisfied = False
                         current_failed_reasons.append(f"Cell above '{up_cell}' doesn't match expected '{self.up}' (similarity: {up_similarity:.2f})")
 
                 # Check down relationship
-                if self.down and row_idx < table_array.shape[0] - 1:
-                    down_cell = normalize_text(table_array[row_idx + 1, col_idx])
-                    down_similarity = fuzz.ratio(self.down, down_cell) / 100.0
+                if self.down and row_idx < num_rows - 1:
+                    down_cell = normalized_cells[(row_idx + 1) * num_cols + col_idx]
+                    down_similarity = _cell_similarity(self.down, down_cell)
                     if down_similarity < threshold:
                         all_relationships_satisfied = False
                         current_failed_reasons.append(f"Cell below '{down_cell}' doesn't match expected '{self.down}' (similarity: {down_similarity:.2f})")
 
                 # Check left relationship
                 if self.left and col_idx > 0:
-                    left_cell = normalize_text(table_array[row_idx, col_idx - 1])
-                    left_similarity = fuzz.ratio(self.left, left_cell) / 100.0
+                    left_cell = normalized_cells[row_idx * num_cols + col_idx - 1]
+                    left_similarity = _cell_similarity(self.left, left_cell)
                     if left_similarity < threshold:
                         all_relationships_satisfied = False
                         current_failed_reasons.append(
@@ -720,9 +1016,9 @@ class TableTest(BasePDFTest):
                         )
 
                 # Check right relationship
-                if self.right and col_idx < table_array.shape[1] - 1:
-                    right_cell = normalize_text(table_array[row_idx, col_idx + 1])
-                    right_similarity = fuzz.ratio(self.right, right_cell) / 100.0
+                if self.right and col_idx < num_cols - 1:
+                    right_cell = normalized_cells[row_idx * num_cols + col_idx + 1]
+                    right_similarity = _cell_similarity(self.right, right_cell)
                     if right_similarity < threshold:
                         all_relationships_satisfied = False
                         current_failed_reasons.append(
@@ -740,7 +1036,9 @@ class TableTest(BasePDFTest):
                     if col_idx in table_data.col_headers:
                         for _, header_text in table_data.col_headers[col_idx]:
                             header_text = normalize_text(header_text)
-                            similarity = fuzz.ratio(self.top_heading, header_text) / 100.0
+                            if _ratio_upper_bound(self.top_heading, header_text) <= best_similarity:
+                                continue
+                            similarity = _cell_similarity(self.top_heading, header_text)
                             if similarity > best_similarity:
                                 best_similarity = similarity
                                 best_match = header_text
@@ -753,7 +1051,9 @@ class TableTest(BasePDFTest):
                         for i in sorted(header_rows):
                             if i < row_idx and table_array[i, col_idx].strip():
                                 header_text = normalize_text(table_array[i, col_idx])
-                                similarity = fuzz.ratio(self.top_heading, header_text) / 100.0
+                                if _ratio_upper_bound(self.top_heading, header_text) <= best_similarity:
+                                    continue
+                                similarity = _cell_similarity(self.top_heading, header_text)
                                 if similarity > best_similarity:
                                     best_similarity = similarity
                                     best_match = header_text
@@ -766,7 +1066,9 @@ class TableTest(BasePDFTest):
                         for i in range(row_idx):
                             if table_array[i, col_idx].strip():
                                 header_text = normalize_text(table_array[i, col_idx])
-                                similarity = fuzz.ratio(self.top_heading, header_text) / 100.0
+                                if _ratio_upper_bound(self.top_heading, header_text) <= best_similarity:
+                                    continue
+                                similarity = _cell_similarity(self.top_heading, header_text)
                                 if similarity > best_similarity:
                                     best_similarity = similarity
                                     best_match = header_text
@@ -791,7 +1093,9 @@ class TableTest(BasePDFTest):
                     if row_idx in table_data.row_headers:
                         for _, header_text in table_data.row_headers[row_idx]:
                             header_text = normalize_text(header_text)
-                            similarity = fuzz.ratio(self.left_heading, header_text) / 100.0
+                            if _ratio_upper_bound(self.left_heading, header_text) <= best_similarity:
+                                continue
+                            similarity = _cell_similarity(self.left_heading, header_text)
                             if similarity > best_similarity:
                                 best_similarity = similarity
                                 best_match = header_text
@@ -804,7 +1108,9 @@ class TableTest(BasePDFTest):
                         for j in sorted(header_cols):
                             if j < col_idx and table_array[row_idx, j].strip():
                                 header_text = normalize_text(table_array[row_idx, j])
-                                similarity = fuzz.ratio(self.left_heading, header_text) / 100.0
+                                if _ratio_upper_bound(self.left_heading, header_text) <= best_similarity:
+                                    continue
+                                similarity = _cell_similarity(self.left_heading, header_text)
                                 if similarity > best_similarity:
                                     best_similarity = similarity
                                     best_match = header_text
@@ -817,7 +1123,9 @@ class TableTest(BasePDFTest):
                         for j in range(col_idx):
                             if table_array[row_idx, j].strip():
                                 header_text = normalize_text(table_array[row_idx, j])
-                                similarity = fuzz.ratio(self.left_heading, header_text) / 100.0
+                                if _ratio_upper_bound(self.left_heading, header_text) <= best_similarity:
+                                    continue
+                                similarity = _cell_similarity(self.left_heading, header_text)
                                 if similarity > best_similarity:
                                     best_similarity = similarity
                                     best_match = header_text
@@ -844,7 +1152,41 @@ class TableTest(BasePDFTest):
             return False, f"Found cells matching '{self.cell}' but relationships were not satisfied: {'; '.join(failed_reasons)}"
 
 
-@dataclass
+# Inclusive codepoint ranges that are not allowed to show up in the output of an english-language document
+_DISALLOWED_CODEPOINT_RANGES = (
+    (0x4E00, 0x9FFF),  # CJK Unified Ideographs (Chinese characters)
+    (0x3040, 0x309F),  # Hiragana (Japanese)
+    (0x30A0, 0x30FF),  # Katakana (Japanese)
+    (0x1F600, 0x1F64F),  # Emoticons (Emoji)
+    (0x1F300, 0x1F5FF),  # Miscellaneous Symbols and Pictographs (Emoji)
+    (0x1F680, 0x1F6FF),  # Transport and Map Symbols (Emoji)
+    (0x1F1E0, 0x1F1FF),  # Regional Indicator Symbols (flags, Emoji)
+)
+
+
+def _find_disallowed_characters(content: str) -> List[str]:
+    """
+    Returns every character in content that falls in one of the disallowed codepoint ranges, in order of appearance.
+
+    The scan runs as vectorized comparisons over the UTF-32 codepoints rather than a per-character Python loop.
+    """
+    # Every disallowed range lies outside ASCII, and isascii() only reads a flag CPython keeps on the string
+    if content.isascii():
+        return []
+
+    codepoints = np.frombuffer(content.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+
+    mask = np.zeros(codepoints.shape, dtype=bool)
+    for low, high in _DISALLOWED_CODEPOINT_RANGES:
+        mask |= (codepoints >= low) & (codepoints <= high)
+
+    if not mask.any():
+        return []
+
+    return [chr(c) for c in codepoints[mask]]
+
+
+@dataclass(slots=True)
 class BaselineTest(BasePDFTest):
     """
     This test makes sure that several baseline quality checks pass for the output generation.
@@ -871,25 +1213,14 @@ class BaselineTest(BasePDFTest):
             if count > self.max_repeats:
                 return False, f"Text ends with {count} repeating {index+1}-grams, invalid"
 
-        pattern = re.compile(
-            r"["
-            r"\u4e00-\u9FFF"  # CJK Unified Ideographs (Chinese characters)
-            r"\u3040-\u309F"  # Hiragana (Japanese)
-            r"\u30A0-\u30FF"  # Katakana (Japanese)
-            r"\U0001F600-\U0001F64F"  # Emoticons (Emoji)
-            r"\U0001F300-\U0001F5FF"  # Miscellaneous Symbols and Pictographs (Emoji)
-            r"\U0001F680-\U0001F6FF"  # Transport and Map Symbols (Emoji)
-            r"\U0001F1E0-\U0001F1FF"  # Regional Indicator Symbols (flags, Emoji)
-            r"]",
-            flags=re.UNICODE,
-        )
-        matches = pattern.findall(content)
+        matches = _find_disallowed_characters(content)
         if matches:
             return False, f"Text contains disallowed characters {matches}"
 
         return True, ""
 
 
+# Not slotted, so that the reference render can live on the instance without becoming a dataclass field
 @dataclass
 class MathTest(BasePDFTest):
     math: str
@@ -950,6 +1281,78 @@ class MathTest(BasePDFTest):
         return False, f"No match found for {self.math} anywhere in content"
 
 
+class PageEvaluator:
+    """
+    Runs all of the tests belonging to a single (pdf, page) against candidate outputs for that page.
+
+    Exact TextPresenceTests (max_diffs of 0, no first_n/last_n window) are answered together: their patterns are
+    compiled into one Aho-Corasick automaton per case sensitivity, so each page is scanned once instead of once per test.
+    Every other test, and every failing exact test (to build its explanation), goes through its regular run method.
+    """
+
+    def __init__(self, tests: List[BasePDFTest]):
+        self.tests = tests
+
+        # Maps case_sensitive -> automaton over the exact patterns with that setting
+        self._automatons = {}
+
+        for case_sensitive in (True, False):
+            patterns = {test.query for test in tests if self._is_exact_presence_test(test) and test.case_sensitive == case_sensitive}
+            if not patterns:
+                continue
+
+            automaton = ahocorasick.Automaton()
+            for pattern in patterns:
+                automaton.add_word(pattern, pattern)
+            automaton.make_automaton()
+            self._automatons[case_sensitive] = automaton
+
+    @staticmethod
+    def _is_exact_presence_test(test: BasePDFTest) -> bool:
+        return isinstance(test, TextPresenceTest) and test.max_diffs == 0 and not test.first_n and not test.last_n
+
+    def run(self, md_content: str) -> List[Tuple[BasePDFTest, bool, str, Optional[str]]]:
+        """
+        Run every test for this page on the provided markdown content.
+
+        Args:
+            md_content: The content of the .md file.
+
+        Returns:
+            A list of (test, passed, explanation, error) tuples in the same order as the tests, where error is set
+            if the test raised an exception, in which case passed is False and the explanation is the error message.
+        """
+        # Patterns found anywhere in the normalized content, keyed by case sensitivity
+        found_patterns = {}
+        for case_sensitive, automaton in self._automatons.items():
+            content = _normalized_content(md_content, not case_sensitive)
+            found_patterns[case_sensitive] = (len(content), {pattern for _, pattern in automaton.iter(content)})
+
+        results = []
+        for test in self.tests:
+            try:
+                passed, explanation = None, ""
+
+                if self._is_exact_presence_test(test):
+                    content_len, found = found_patterns[test.case_sensitive]
+                    pattern = test.query
+
+                    # Fuzzy partial matching also accepts content that is a substring of a longer pattern, so that case is left to run()
+                    if len(pattern) <= content_len:
+                        is_present = pattern in found
+                        if is_present == (test.type == TestType.PRESENT.value):
+                            passed = True
+
+                if passed is None:
+                    passed, explanation = test.run(md_content)
+
+                results.append((test, passed, explanation, None))
+            except Exception as e:
+                results.append((test, False, str(e), str(e)))
+
+        return results
+
+
 def load_tests(jsonl_file: str) -> List[BasePDFTest]:
     """
     Load tests from a JSONL file using parallel processing with a ThreadPoolExecutor.
@@ -961,7 +1364,7 @@ def load_tests(jsonl_file: str) -> List[BasePDFTest]:
         A list of test objects.
     """
 
-    def process_line(line_tuple: Tuple[int, str]) -> Optional[Tuple[int, BasePDFTest]]:
+    def process_line(line_tuple: Tuple[int, bytes]) -> Optional[Tuple[int, BasePDFTest]]:
         """
         Process a single line from the JSONL file and return a tuple of (line_number, test object).
         Returns None for empty lines.
@@ -972,7 +1375,7 @@ def load_tests(jsonl_file: str) -> List[BasePDFTest]:
             return None
 
         try:
-            data = json.loads(line)
+            data = orjson.loads(line)
             test_type = data.get("type")
             if test_type in {TestType.PRESENT.value, TestType.ABSENT.value}:
                 test = TextPresenceTest(**data)
@@ -985,7 +1388,7 @@ def load_tests(jsonl_file: str) -> List[BasePDFTest]:
             else:
                 raise ValidationError(f"Unknown test type: {test_type}")
             return (line_number, test)
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             print(f"Error parsing JSON on line {line_number}: {e}")
             raise
         except (ValidationError, KeyError) as e:
@@ -998,7 +1401,8 @@ def load_tests(jsonl_file: str) -> List[BasePDFTest]:
     tests = []
 
     # Read all lines along with their line numbers.
-    with open(jsonl_file, "r") as f:
+    # orjson parses the raw UTF-8 bytes directly, so there is no need to decode each line first.
+    with open(jsonl_file, "rb") as f:
         lines = list(enumerate(f, start=1))
 
     # Use a ThreadPoolExecutor to process each line in parallel.
@@ -1024,12 +1428,14 @@ def load_tests(jsonl_file: str) -> List[BasePDFTest]:
 
 def save_tests(tests: List[BasePDFTest], jsonl_file: str) -> None:
     """
-    Save tests to a JSONL file using asdict for conversion.
+    Save tests to a JSONL file, writing out only the fields accepted by the test constructors.
 
     Args:
         tests: A list of test objects.
         jsonl_file: Path to the output JSONL file.
     """
-    with open(jsonl_file, "w") as file:
+    with open(jsonl_file, "wb") as file:
         for test in tests:
-            file.write(json.dumps(asdict(test)) + "\n")
\ No newline at end of file
+            # Derived fields (init=False) are recomputed on load, so they are not written out
+            data = {f.name: getattr(test, f.name) for f in fields(test) if f.init}
+            file.write(orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE))
@@ -4,6 +4,49 @@ import string
 import time
 import unittest
 
+try:
+    import numba
+    import numpy as np
+except ImportError:
+    numba = None
+
+
+def _tail_repeat_counts(codes, max_ngram_size: int):
+    """
+    For each n-gram size from 1 to max_ngram_size, counts how many times the final n-gram of codes
+    repeats back to back at the end of the sequence. Written as plain loops over an integer array so that it
+    can be compiled with numba.
+    """
+    length = codes.shape[0]
+    result = np.zeros(max_ngram_size, dtype=np.int64)
+
+    for size in range(1, max_ngram_size + 1):
+        if length < size:
+            continue
+
+        target_start = length - size
+        count = 0
+        pos = target_start
+
+        while pos >= 0:
+            matched = True
+            for k in range(size):
+                if codes[pos + k] != codes[target_start + k]:
+                    matched = False
+                    break
+            if not matched:
+                break
+            count += 1
+            pos -= size
+
+        result[size - 1] = count
+
+    return result
+
+
+# Compiled lazily on first call (or loaded from numba's on-disk cache), so importing this module stays cheap and fork safe
+_tail_repeat_counts_jit = numba.njit(cache=True)(_tail_repeat_counts) if numba is not None else None
+
 
 class RepeatDetector:
     def __init__(self, max_ngram_size: int = 10):
@@ -22,6 +65,10 @@ class RepeatDetector:
         # Normalize all whitespace to single spaces
         text = re.sub(r"\s+", " ", self.data)
 
+        if _tail_repeat_counts_jit is not None:
+            codes = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+            return _tail_repeat_counts_jit(codes, self.max_ngram_size).tolist()
+
         # For each n-gram size
         for size in range(1, self.max_ngram_size + 1):
             if len(text) < size: